@@ -1,4 +1,6 @@
-from pydantic_settings import BaseSettings, Field
+from typing import Optional
+from pydantic import Field
+from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     """
@@ -15,6 +17,71 @@ class Settings(BaseSettings):
         env="DEBEZIUM_CONNECTOR_URL",  
     )
 
+    DEBEZIUM_HTTP_TIMEOUT: float = Field(
+        default=5.0,
+        gt=0,
+        env="DEBEZIUM_HTTP_TIMEOUT",
+    )
+
+    DEBEZIUM_HTTP_MAX_CONNECTIONS: int = Field(
+        default=20,
+        ge=1,
+        env="DEBEZIUM_HTTP_MAX_CONNECTIONS",
+    )
+
+    DEBEZIUM_HTTP_MAX_RETRIES: int = Field(
+        default=3,
+        ge=0,
+        env="DEBEZIUM_HTTP_MAX_RETRIES",
+    )
+
+    DEBEZIUM_CACHE_TTL: float = Field(
+        default=2.0,
+        ge=0,
+        env="DEBEZIUM_CACHE_TTL",
+    )
+
+    KAFKA_METADATA_CACHE_TTL: float = Field(
+        default=5.0,
+        ge=0,
+        env="KAFKA_METADATA_CACHE_TTL",
+    )
+
+    KAFKA_INVENTORY_CACHE_TTL: float = Field(
+        default=10.0,
+        ge=0,
+        env="KAFKA_INVENTORY_CACHE_TTL",
+    )
+
+    CONSUMER_REPLICA_ID: Optional[str] = Field(
+        default=None,
+        env="CONSUMER_REPLICA_ID",
+    )
+
+    CONSUMER_SCHEDULER_WORKERS: int = Field(
+        default=4,
+        ge=1,
+        env="CONSUMER_SCHEDULER_WORKERS",
+    )
+
+    CONSUMER_TIME_SLICE_MS: float = Field(
+        default=50.0,
+        gt=0,
+        env="CONSUMER_TIME_SLICE_MS",
+    )
+
+    CONSUMER_IDLE_BACKOFF_MS: float = Field(
+        default=100.0,
+        gt=0,
+        env="CONSUMER_IDLE_BACKOFF_MS",
+    )
+
+    CONSUMER_QUEUED_MAX_KBYTES: Optional[int] = Field(
+        default=16384,
+        ge=1,
+        env="CONSUMER_QUEUED_MAX_KBYTES",
+    )
+
     class Config:
         env_file = "./core/.env"
 
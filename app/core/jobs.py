@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Optional
+from fastapi import HTTPException, Response, status
+
+class JobManager:
+    """
+    In-process registry of background admin operations. Each job wraps a coroutine scheduled on the
+    running event loop and can be polled by id until it finishes. Finished jobs are kept for
+    `retention_seconds` so their results can still be read. Long-running jobs may pass a `progress`
+    callable whose snapshot is reported while the job runs.
+    """
+
+    def __init__(self, retention_seconds: float = 3600):
+        self.retention_seconds = retention_seconds
+        self._jobs = {}
+        self._tasks = {}
+        self._progress = {}
+
+    def submit(self, operation: str, coroutine: Awaitable, progress: Optional[Callable[[], dict]] = None) -> dict:
+        self._evict_finished()
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = {
+            "job_id": job_id,
+            "operation": operation,
+            "status": "pending",
+            "created_at": time.time(),
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "progress": None
+        }
+        if progress is not None:
+            self._progress[job_id] = progress
+        self._tasks[job_id] = asyncio.create_task(self._run(job_id, coroutine))
+        return self.get(job_id)
+
+    async def _run(self, job_id: str, coroutine: Awaitable):
+        job = self._jobs[job_id]
+        job["status"] = "running"
+        try:
+            job["result"] = await coroutine
+            job["status"] = "succeeded"
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+            raise
+        except HTTPException as e:
+            job["status"] = "failed"
+            job["error"] = {"status_code": e.status_code, "detail": e.detail}
+        except Exception as e:
+            logging.error(f"Job {job_id} ({job['operation']}) failed: {e}")
+            job["status"] = "failed"
+            job["error"] = {"status_code": 500, "detail": str(e)}
+        finally:
+            job["finished_at"] = time.time()
+            self._tasks.pop(job_id, None)
+            progress = self._progress.pop(job_id, None)
+            if progress is not None:
+                job["progress"] = progress()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        if not job:
+            return None
+        job = dict(job)
+        progress = self._progress.get(job_id)
+        if progress is not None:
+            job["progress"] = progress()
+        return job
+
+    def list(self) -> list:
+        self._evict_finished()
+        return [
+            {key: job[key] for key in ("job_id", "operation", "status", "created_at", "finished_at")}
+            for job in self._jobs.values()
+        ]
+
+    def _evict_finished(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+job_manager = JobManager()
+
+async def run_or_submit(operation: str, coroutine: Awaitable, background: bool, response: Response,
+                        progress: Optional[Callable[[], dict]] = None):
+    """
+    Awaits `coroutine` inline, or registers it as a background job and answers 202 with the job handle
+    when `background` is set.
+    """
+    if background:
+        response.status_code = status.HTTP_202_ACCEPTED
+        return job_manager.submit(operation, coroutine, progress)
+    return await coroutine
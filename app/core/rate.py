@@ -0,0 +1,51 @@
+import threading
+
+class SlidingWindowRate:
+    """
+    Thread-safe event counter over the last `window_seconds` seconds.
+
+    Events are counted in a fixed ring of per-second buckets, so memory is constant per window and
+    recording an event is O(1) (amortised over the seconds the window advances). Time is taken from the
+    event's own epoch-ms timestamp; events older than the window are ignored.
+    """
+
+    def __init__(self, window_seconds: int):
+        if window_seconds < 1:
+            raise ValueError("window_seconds must be at least 1")
+        self.window_seconds = window_seconds
+        self._counts = [0] * window_seconds
+        self._total = 0
+        self._head = None
+        self._lock = threading.Lock()
+
+    def _advance(self, second: int):
+        if self._head is None or second - self._head >= self.window_seconds:
+            self._counts = [0] * self.window_seconds
+            self._total = 0
+        else:
+            for expired in range(self._head + 1, second + 1):
+                index = expired % self.window_seconds
+                self._total -= self._counts[index]
+                self._counts[index] = 0
+        self._head = second
+
+    def add(self, epoch_ms: int, count: int = 1):
+        second = epoch_ms // 1000
+        with self._lock:
+            if self._head is None or second > self._head:
+                self._advance(second)
+            elif second <= self._head - self.window_seconds:
+                return
+            self._counts[second % self.window_seconds] += count
+            self._total += count
+
+    def rate(self) -> float:
+        """Average events per second over the window ending at the newest recorded event."""
+        with self._lock:
+            return self._total / self.window_seconds
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * self.window_seconds
+            self._total = 0
+            self._head = None
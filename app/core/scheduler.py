@@ -0,0 +1,112 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+
+class CooperativeScheduler:
+    """
+    M:N scheduler that runs many cooperative tasks on a small fixed pool of worker threads.
+
+    A task exposes `run_slice(deadline) -> Optional[bool]`. It must not block, and it should return once
+    `deadline` (time.monotonic()) has passed. The return value tells the scheduler whether the task did
+    work (True: requeued at the back of the round-robin), was idle (False: parked with an exponential
+    backoff between `idle_backoff_min` and `idle_backoff_max` seconds) or finished (None: dropped).
+    A task is never run by two workers at once.
+    """
+
+    def __init__(self, workers: int = 4, time_slice: float = 0.05,
+                 idle_backoff_min: float = 0.005, idle_backoff_max: float = 0.1):
+        self.workers = workers
+        self.time_slice = time_slice
+        self.idle_backoff_min = min(idle_backoff_min, idle_backoff_max)
+        self.idle_backoff_max = idle_backoff_max
+        self._ready = deque()
+        self._sleeping = []
+        self._states = {}
+        self._backoff = {}
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+
+    def submit(self, task):
+        with self._cond:
+            self._start_workers()
+            self._states[task] = "ready"
+            self._backoff[task] = self.idle_backoff_min
+            self._ready.append(task)
+            self._cond.notify()
+
+    def wake(self, task):
+        """Runs a parked task as soon as a worker is free, e.g. after it was asked to stop."""
+        with self._cond:
+            state = self._states.get(task)
+            if state == "sleeping":
+                self._states[task] = "ready"
+                self._ready.append(task)
+                self._cond.notify()
+            elif state == "running":
+                self._states[task] = "woken"
+
+    def stats(self) -> dict:
+        with self._cond:
+            states = list(self._states.values())
+            return {
+                "workers": len(self._threads),
+                "tasks": len(states),
+                "ready": states.count("ready"),
+                "running": states.count("running") + states.count("woken"),
+                "sleeping": states.count("sleeping"),
+                "time_slice_ms": self.time_slice * 1000,
+            }
+
+    def _start_workers(self):
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker, name=f"scheduler-{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _worker(self):
+        while True:
+            task = self._next_task()
+            try:
+                result = task.run_slice(time.monotonic() + self.time_slice)
+            except Exception as e:
+                logging.error(f"Scheduled task {task} failed: {e}")
+                result = None
+            self._reschedule(task, result)
+
+    def _next_task(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._sleeping and self._sleeping[0][0] <= now:
+                    _, _, task = heapq.heappop(self._sleeping)
+                    if self._states.get(task) == "sleeping":
+                        self._states[task] = "ready"
+                        self._ready.append(task)
+                if self._ready:
+                    task = self._ready.popleft()
+                    self._states[task] = "running"
+                    return task
+                self._cond.wait(self._sleeping[0][0] - now if self._sleeping else None)
+
+    def _reschedule(self, task, result):
+        with self._cond:
+            if result is None:
+                self._states.pop(task, None)
+                self._backoff.pop(task, None)
+                return
+            if result or self._states.get(task) == "woken":
+                self._backoff[task] = self.idle_backoff_min
+                self._states[task] = "ready"
+                self._ready.append(task)
+            else:
+                backoff = self._backoff[task]
+                self._backoff[task] = min(backoff * 2, self.idle_backoff_max)
+                self._states[task] = "sleeping"
+                heapq.heappush(self._sleeping, (time.monotonic() + backoff, next(self._sequence), task))
+            self._cond.notify()
@@ -0,0 +1,202 @@
+"""
+In-process load test for the REST API.
+
+Drives the real FastAPI app (main.py and its routers) through httpx's ASGI transport, with the Kafka
+AdminClient, Kafka Connect REST API, Redis and Kafka Consumer replaced by local stand-ins of configurable
+latency. Reports requests/s and latency percentiles per endpoint at increasing concurrency, plus how many
+clients and connections the app created, so threadpool exhaustion and per-request client construction
+show up as regressions.
+
+    cd app && python -m loadtest --concurrency 1,8,32,64 --requests 400
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import statistics
+import time
+import uuid
+import httpx
+from loadtest.standins import (
+    StandInAdminClient, StandInConnectServer, StandInRedis, StandInConsumer, counters
+)
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--concurrency", default="1,8,32,64",
+                        help="Comma-separated concurrency levels (default: 1,8,32,64)")
+    parser.add_argument("--requests", type=int, default=400,
+                        help="Requests per concurrency level (default: 400)")
+    parser.add_argument("--admin-latency-ms", type=float, default=20.0,
+                        help="Latency of AdminClient futures (default: 20)")
+    parser.add_argument("--metadata-latency-ms", type=float, default=20.0,
+                        help="Latency of blocking AdminClient.list_topics (default: 20)")
+    parser.add_argument("--connect-latency-ms", type=float, default=20.0,
+                        help="Latency of each Kafka Connect REST call (default: 20)")
+    parser.add_argument("--redis-latency-ms", type=float, default=1.0,
+                        help="Latency of each Redis command (default: 1)")
+    parser.add_argument("--topics", type=int, default=200, help="Topics known to the stand-in broker")
+    parser.add_argument("--partitions", type=int, default=3, help="Partitions per stand-in topic")
+    parser.add_argument("--connectors", type=int, default=50, help="Connectors known to the stand-in Connect")
+    parser.add_argument("--consumers", type=int, default=20, help="Consumers started before the run")
+    parser.add_argument("--events-per-poll", type=float, default=0.5,
+                        help="Probability that a stand-in consumer poll returns an event (default: 0.5)")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this JSON file")
+    return parser.parse_args()
+
+def install_standins(args) -> StandInConnectServer:
+    """Points the app at the stand-ins. Must run before `main` is imported."""
+    StandInAdminClient.configure(
+        latency_ms=args.admin_latency_ms,
+        metadata_latency_ms=args.metadata_latency_ms,
+        initial_topics=args.topics,
+        partitions=args.partitions
+    )
+    StandInRedis.latency_ms = args.redis_latency_ms
+    StandInConsumer.events_per_poll = args.events_per_poll
+    connect_server = StandInConnectServer(latency_ms=args.connect_latency_ms, connectors=args.connectors).start()
+
+    from core.config import settings
+    settings.DEBEZIUM_CONNECTOR_URL = connect_server.url
+
+    import services.topic
+    import services.consumer
+    services.topic.AdminClient = StandInAdminClient
+    services.consumer.Consumer = StandInConsumer
+    services.consumer.redis.StrictRedis = StandInRedis
+    return connect_server
+
+def build_scenarios(args, consumer_ids):
+    topics = list(StandInAdminClient.topics)
+    connectors = [f"connector-{i}" for i in range(args.connectors)]
+    return [
+        ("GET /topic/list", lambda: ("GET", "/topic/list", None)),
+        ("GET /topic/inventory", lambda: ("GET", "/topic/inventory?limit=50", None)),
+        ("POST /topic/config", lambda: ("POST", "/topic/config", {"topic_name": random.choice(topics)})),
+        ("POST /topic/bulk/create", lambda: ("POST", "/topic/bulk/create", {
+            "topics": [{"topic_name": f"loadtest.{uuid.uuid4().hex}"} for _ in range(10)]
+        })),
+        ("GET /debezium/list/", lambda: ("GET", "/debezium/list/", None)),
+        ("GET /debezium/fleet/", lambda: ("GET", "/debezium/fleet/", None)),
+        ("GET /debezium/connector/{name}/info/", lambda: (
+            "GET", f"/debezium/connector/{random.choice(connectors)}/info/", None
+        )),
+        ("GET /consumer/list", lambda: ("GET", "/consumer/list", None)),
+        ("GET /consumer/info/{consumer_id}", lambda: (
+            "GET", f"/consumer/info/{random.choice(consumer_ids)}", None
+        )),
+    ]
+
+def percentile(samples, fraction):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[int(fraction * 100) - 1]
+
+async def run_level(client: httpx.AsyncClient, scenarios, concurrency: int, total_requests: int) -> dict:
+    latencies = {name: [] for name, _ in scenarios}
+    errors = {name: 0 for name, _ in scenarios}
+    schedule = itertools.cycle(scenarios)
+    remaining = total_requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            name, request_factory = next(schedule)
+            method, path, body = request_factory()
+            started_at = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                failed = response.status_code >= 400 or (
+                    isinstance(response.json(), dict) and "error" in response.json()
+                )
+            except Exception:
+                failed = True
+            latencies[name].append(time.perf_counter() - started_at)
+            errors[name] += failed
+
+    counters_before = counters.snapshot()
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    counters_after = counters.snapshot()
+
+    endpoints = {}
+    for name, samples in latencies.items():
+        if not samples:
+            continue
+        endpoints[name] = {
+            "requests": len(samples),
+            "errors": errors[name],
+            "requests_per_second": len(samples) / elapsed,
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p95_ms": percentile(samples, 0.95) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+        }
+    return {
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "requests_per_second": total_requests / elapsed,
+        "endpoints": endpoints,
+        "counters": {
+            key: counters_after.get(key, 0) - counters_before.get(key, 0)
+            for key in sorted(set(counters_after) | set(counters_before))
+        },
+    }
+
+def print_level(result: dict):
+    print(f"\nconcurrency={result['concurrency']}  total={result['requests_per_second']:.1f} req/s  "
+          f"elapsed={result['elapsed_seconds']:.2f}s")
+    print(f"  {'endpoint':<40} {'reqs':>6} {'errs':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, stats in result["endpoints"].items():
+        print(f"  {name:<40} {stats['requests']:>6} {stats['errors']:>5} {stats['requests_per_second']:>8.1f} "
+              f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+    print("  " + "  ".join(f"{key}={value}" for key, value in result["counters"].items()))
+
+async def run(args) -> list:
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=120) as client:
+        consumer_ids = []
+        for i in range(args.consumers):
+            consumer_id = f"loadtest-consumer-{i}"
+            response = await client.post("/consumer/start", json={
+                "consumer_id": consumer_id,
+                "kafka_topic": list(StandInAdminClient.topics)[i % len(StandInAdminClient.topics)],
+                "pipeline_name": f"loadtest-pipeline-{i}",
+                "max_event": 1000,
+                "max_time": 3600,
+            })
+            response.raise_for_status()
+            consumer_ids.append(consumer_id)
+
+        scenarios = build_scenarios(args, consumer_ids or ["missing"])
+        results = []
+        try:
+            for concurrency in (int(level) for level in args.concurrency.split(",")):
+                result = await run_level(client, scenarios, concurrency, args.requests)
+                print_level(result)
+                results.append(result)
+        finally:
+            for consumer_id in consumer_ids:
+                await client.post("/consumer/stop", params={"consumer_id": consumer_id})
+        return results
+
+def main_cli():
+    args = parse_args()
+    # services.consumer configures INFO logging; httpx would log every one of the load test's requests.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    connect_server = install_standins(args)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        connect_server.stop()
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump({"arguments": vars(args), "levels": results}, output, indent=2)
+
+if __name__ == "__main__":
+    main_cli()
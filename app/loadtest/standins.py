@@ -0,0 +1,447 @@
+"""
+Local stand-ins for the external systems the API talks to, with configurable latency.
+
+- `StandInAdminClient` replaces confluent_kafka's AdminClient. Admin futures complete on a timer thread.
+- `StandInConnectServer` is a real HTTP server implementing the Kafka Connect REST endpoints the API uses.
+- `StandInRedis` replaces redis.StrictRedis with an in-memory hash store.
+- `StandInConsumer` replaces confluent_kafka's Consumer and yields synthetic Debezium change events.
+
+Every stand-in counts how often it is constructed or connected to, so per-request client construction
+shows up in the load-test report.
+"""
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from confluent_kafka import KafkaError, KafkaException
+
+class Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.values = {}
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self.values[name] = self.values.get(name, 0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.values)
+
+counters = Counters()
+
+def _sleep_ms(latency_ms: float):
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000)
+
+def _delayed(latency_ms: float, result=None, error: Exception = None) -> Future:
+    future = Future()
+    future.set_running_or_notify_cancel()
+
+    def complete():
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    if latency_ms > 0:
+        timer = threading.Timer(latency_ms / 1000, complete)
+        timer.daemon = True
+        timer.start()
+    else:
+        complete()
+    return future
+
+
+class _PartitionMetadata:
+    def __init__(self, partition_id: int):
+        self.id = partition_id
+        self.leader = 1
+        self.replicas = [1]
+        self.isrs = [1]
+
+class _TopicMetadata:
+    def __init__(self, topic: str, num_partitions: int):
+        self.topic = topic
+        self.error = None
+        self.partitions = {i: _PartitionMetadata(i) for i in range(num_partitions)}
+
+class _ClusterMetadata:
+    def __init__(self, topics: dict):
+        self.topics = topics
+
+class _OffsetResult:
+    def __init__(self, offset: int):
+        self.offset = offset
+
+class _ConfigEntry:
+    def __init__(self, value: str):
+        self.value = value
+        self.source = "DYNAMIC_TOPIC_CONFIG"
+        self.is_default = False
+        self.is_read_only = False
+        self.is_sensitive = False
+
+class StandInAdminClient:
+    """In-memory AdminClient. `metadata_latency_ms` applies to blocking calls, `latency_ms` to futures."""
+
+    latency_ms = 20.0
+    metadata_latency_ms = 20.0
+    topics = {}
+    lock = threading.Lock()
+
+    def __init__(self, config: dict = None):
+        counters.increment("admin_clients_created")
+
+    @classmethod
+    def configure(cls, latency_ms: float, metadata_latency_ms: float, initial_topics: int, partitions: int):
+        cls.latency_ms = latency_ms
+        cls.metadata_latency_ms = metadata_latency_ms
+        cls.topics = {
+            f"db.public.table{i}": {"partitions": partitions, "high": random.randint(0, 100000), "config": {}}
+            for i in range(initial_topics)
+        }
+
+    def list_topics(self, timeout: float = None):
+        counters.increment("admin_metadata_requests")
+        _sleep_ms(self.metadata_latency_ms)
+        with self.lock:
+            return _ClusterMetadata({
+                name: _TopicMetadata(name, topic["partitions"]) for name, topic in self.topics.items()
+            })
+
+    def create_topics(self, new_topics, **kwargs):
+        counters.increment("admin_requests")
+        futures = {}
+        with self.lock:
+            for new_topic in new_topics:
+                if new_topic.topic in self.topics:
+                    error = KafkaException(KafkaError(
+                        KafkaError.TOPIC_ALREADY_EXISTS, f"Topic '{new_topic.topic}' already exists."
+                    ))
+                    futures[new_topic.topic] = _delayed(self.latency_ms, error=error)
+                    continue
+                self.topics[new_topic.topic] = {
+                    "partitions": new_topic.num_partitions, "high": 0, "config": dict(new_topic.config or {})
+                }
+                futures[new_topic.topic] = _delayed(self.latency_ms)
+        return futures
+
+    def delete_topics(self, topic_names, **kwargs):
+        counters.increment("admin_requests")
+        with self.lock:
+            for name in topic_names:
+                self.topics.pop(name, None)
+        return {name: _delayed(self.latency_ms) for name in topic_names}
+
+    def alter_configs(self, resources, **kwargs):
+        counters.increment("admin_requests")
+        futures = {}
+        with self.lock:
+            for resource in resources:
+                topic = self.topics.get(resource.name)
+                if topic is not None:
+                    topic["config"].update(resource.set_config_dict)
+                futures[resource] = _delayed(self.latency_ms)
+        return futures
+
+    def incremental_alter_configs(self, resources, **kwargs):
+        counters.increment("admin_requests")
+        futures = {}
+        with self.lock:
+            for resource in resources:
+                topic = self.topics.get(resource.name)
+                if topic is not None:
+                    topic["config"].update({entry.name: entry.value for entry in resource.incremental_configs})
+                futures[resource] = _delayed(self.latency_ms)
+        return futures
+
+    def describe_configs(self, resources, **kwargs):
+        counters.increment("admin_requests")
+        futures = {}
+        with self.lock:
+            for resource in resources:
+                config = self.topics.get(resource.name, {}).get("config", {})
+                futures[resource] = _delayed(
+                    self.latency_ms, result={key: _ConfigEntry(value) for key, value in config.items()}
+                )
+        return futures
+
+    def create_partitions(self, new_partitions, **kwargs):
+        counters.increment("admin_requests")
+        with self.lock:
+            for new_partition in new_partitions:
+                self.topics[new_partition.topic]["partitions"] = new_partition.new_total_count
+        return {new_partition.topic: _delayed(self.latency_ms) for new_partition in new_partitions}
+
+    def list_offsets(self, topic_partition_offsets: dict, **kwargs):
+        counters.increment("admin_requests")
+        futures = {}
+        with self.lock:
+            for tp, spec in topic_partition_offsets.items():
+                high = self.topics.get(tp.topic, {}).get("high", 0)
+                earliest = type(spec).__name__ == "EarliestSpec"
+                futures[tp] = _delayed(self.latency_ms, result=_OffsetResult(0 if earliest else high))
+        return futures
+
+
+class StandInConnectServer:
+    """
+    Threaded HTTP server answering the Kafka Connect REST endpoints used by DebeziumService:
+    /connectors (GET, POST, ?expand=status&expand=info), /connectors/{name} (GET, DELETE),
+    /connectors/{name}/config (GET, PUT).
+
+    `fail_next` queues error responses that are answered, in order, to the next requests instead of
+    serving them, e.g. the 409 Connect returns while its worker group rebalances.
+    """
+
+    def __init__(self, latency_ms: float = 20.0, connectors: int = 50):
+        self.latency_ms = latency_ms
+        self.lock = threading.Lock()
+        self.connectors = {
+            f"connector-{i}": {
+                "connector.class": "io.debezium.connector.postgresql.PostgresConnector",
+                "topic.prefix": f"db{i}",
+                "database.password": "secret",
+            }
+            for i in range(connectors)
+        }
+        self.failures = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/connectors"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def fail_next(self, status_code: int, message: str, times: int = 1):
+        with self.lock:
+            self.failures.extend([(status_code, message)] * times)
+
+    def _status(self, name: str) -> dict:
+        return {
+            "name": name,
+            "type": "source",
+            "connector": {"state": "RUNNING", "worker_id": "127.0.0.1:8083"},
+            "tasks": [{"id": 0, "state": "RUNNING", "worker_id": "127.0.0.1:8083"}]
+        }
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                counters.increment("connect_connections_opened")
+
+            def _reply(self, status_code: int, body=None):
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length)) if length else None
+
+            def _route(self):
+                counters.increment("connect_requests")
+                _sleep_ms(standin.latency_ms)
+                parsed = urlparse(self.path)
+                parts = [part for part in parsed.path.split("/") if part][1:]
+                return parts, parse_qs(parsed.query)
+
+            def _injected_failure(self) -> bool:
+                with standin.lock:
+                    if not standin.failures:
+                        return False
+                    status_code, message = standin.failures.pop(0)
+                self._reply(status_code, {"error_code": status_code, "message": message})
+                return True
+
+            def do_GET(self):
+                parts, query = self._route()
+                if self._injected_failure():
+                    return
+                with standin.lock:
+                    if not parts:
+                        if "expand" in query:
+                            return self._reply(200, {
+                                name: {
+                                    "info": {"name": name, "type": "source", "config": config, "tasks": []},
+                                    "status": standin._status(name)
+                                }
+                                for name, config in standin.connectors.items()
+                            })
+                        return self._reply(200, list(standin.connectors))
+                    config = standin.connectors.get(parts[0])
+                    if config is None:
+                        return self._reply(404, {"error_code": 404, "message": f"Connector {parts[0]} not found"})
+                    if parts[1:] == ["config"]:
+                        return self._reply(200, config)
+                    if parts[1:] == ["status"]:
+                        return self._reply(200, standin._status(parts[0]))
+                    return self._reply(200, {"name": parts[0], "config": config, "tasks": [], "type": "source"})
+
+            def do_POST(self):
+                self._route()
+                body = self._body()
+                if self._injected_failure():
+                    return
+                with standin.lock:
+                    if body["name"] in standin.connectors:
+                        return self._reply(409, {"error_code": 409, "message": f"Connector {body['name']} already exists"})
+                    standin.connectors[body["name"]] = body["config"]
+                return self._reply(201, body)
+
+            def do_PUT(self):
+                parts, _ = self._route()
+                body = self._body()
+                if self._injected_failure():
+                    return
+                with standin.lock:
+                    standin.connectors[parts[0]] = body
+                return self._reply(200, {"name": parts[0], "config": body, "tasks": []})
+
+            def do_DELETE(self):
+                parts, _ = self._route()
+                if self._injected_failure():
+                    return
+                with standin.lock:
+                    if standin.connectors.pop(parts[0], None) is None:
+                        return self._reply(404, {"error_code": 404, "message": f"Connector {parts[0]} not found"})
+                self.send_response(204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        return Handler
+
+
+class StandInRedis:
+    """In-memory replacement for the subset of redis.StrictRedis used by the consumer service."""
+
+    latency_ms = 1.0
+    _store = {}
+    _lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        counters.increment("redis_clients_created")
+
+    def _call(self):
+        counters.increment("redis_commands")
+        _sleep_ms(self.latency_ms)
+
+    def hgetall(self, key):
+        self._call()
+        with self._lock:
+            return dict(self._store.get(key, {}))
+
+    def hget(self, key, field):
+        self._call()
+        with self._lock:
+            return self._store.get(key, {}).get(field)
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        self._call()
+        with self._lock:
+            entry = self._store.setdefault(key, {})
+            if field is not None:
+                entry[field] = str(value)
+            for name, item in (mapping or {}).items():
+                entry[name] = str(item)
+            return 1
+
+
+class StandInMessage:
+    def __init__(self, topic: str, partition: int, offset: int, value: bytes, key: bytes = None, headers=None):
+        self._topic = topic
+        self._partition = partition
+        self._offset = offset
+        self._value = value
+        self._key = key
+        self._headers = headers
+        self._timestamp = int(time.time() * 1000)
+
+    def error(self):
+        return None
+
+    def topic(self):
+        return self._topic
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def key(self):
+        return self._key
+
+    def value(self):
+        return self._value
+
+    def headers(self):
+        return self._headers
+
+    def timestamp(self):
+        return (1, self._timestamp)
+
+class StandInConsumer:
+    """
+    Consumer that emits `events_per_poll` synthetic Debezium change events per poll and otherwise
+    waits out the poll timeout, like an idle librdkafka consumer.
+    """
+
+    events_per_poll = 0.0
+
+    def __init__(self, config: dict):
+        counters.increment("consumers_created")
+        self.config = config
+        self._topics = []
+        self._offset = 0
+        self._closed = False
+
+    def subscribe(self, topics, **kwargs):
+        self._topics = list(topics)
+
+    def poll(self, timeout: float = None):
+        if self._closed:
+            raise RuntimeError("Consumer closed")
+        if self._topics and random.random() < self.events_per_poll:
+            self._offset += 1
+            payload = {
+                "payload": {
+                    "op": random.choice("cud"),
+                    "ts_ms": int(time.time() * 1000),
+                    "source": {"db": "mydatabase", "schema": "public", "table": "orders"}
+                }
+            }
+            return StandInMessage(self._topics[0], 0, self._offset, json.dumps(payload).encode())
+        time.sleep(timeout or 0)
+        return None
+
+    def consume(self, num_messages: int = 1, timeout: float = None):
+        message = self.poll(timeout)
+        return [message] if message is not None else []
+
+    def close(self):
+        self._closed = True
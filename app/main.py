@@ -1,11 +1,18 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-import routers.topic, routers.debezium,routers.consumer
+import routers.topic, routers.debezium,routers.consumer, routers.job
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await routers.debezium.debezium_service.aclose()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(routers.topic.router)
 app.include_router(routers.debezium.router)
 app.include_router(routers.consumer.router)
+app.include_router(routers.job.router)
 
 @app.get("/")
 def root():
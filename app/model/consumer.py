@@ -1,11 +1,52 @@
-from typing import Optional
-from pydantic import BaseModel, Field
+import re
+from datetime import datetime, timezone
+from typing import List, Optional
+from pydantic import BaseModel, Field, validator, root_validator
 from enum import Enum
 
 class OffsetResetStrategy(str, Enum):
     EARLIEST = "earliest"
     LATEST = "latest"
+
+class AssignmentStrategy(str, Enum):
+    RANGE = "range"
+    ROUNDROBIN = "roundrobin"
+    COOPERATIVE_STICKY = "cooperative-sticky"
+
+class CountingMode(str, Enum):
+    DECODE = "decode"
+    OFFSET_DELTA = "offset-delta"
     
+class EventOp(str, Enum):
+    CREATE = "c"
+    UPDATE = "u"
+    DELETE = "d"
+    READ = "r"
+    TRUNCATE = "t"
+    MESSAGE = "m"
+
+class EventFilter(BaseModel):
+    """
+    Include/exclude rules evaluated before an event is decoded. Table patterns are regular expressions
+    matched against `schema.table` as taken from the topic name, key patterns are regular expressions
+    searched in the raw message key, and ops are read from the `__op` header when the connector emits it.
+    An event passes when it matches every include list given and no exclude list.
+    """
+    include_tables: Optional[List[str]] = Field(default=None, example=["public\\.orders"])
+    exclude_tables: Optional[List[str]] = Field(default=None, example=["public\\.audit_.*"])
+    include_ops: Optional[List[EventOp]] = Field(default=None, example=["c", "d"])
+    exclude_ops: Optional[List[EventOp]] = Field(default=None, example=["r"])
+    include_keys: Optional[List[str]] = Field(default=None, example=['"tenant_id":42\\b'])
+    exclude_keys: Optional[List[str]] = Field(default=None)
+
+    @validator('include_tables', 'exclude_tables', 'include_keys', 'exclude_keys', each_item=True)
+    def validate_pattern(cls, v):
+        try:
+            re.compile(v)
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression '{v}': {e}")
+        return v
+
 class ConsumerCreationRequest(BaseModel):
     """
     Request model for creating a new Kafka consumer with configurable polling behavior.
@@ -17,6 +58,14 @@ class ConsumerCreationRequest(BaseModel):
         max_event: Maximum number of events to poll per batch
         max_time: Maximum time in ms to wait for messages
         auto_offset_reset: Offset reset policy when no offset exists
+        rate_threshold: Optional events/s above which a sync is triggered
+        rate_window_seconds: Sliding window (seconds) the event rate is averaged over
+        counting_mode: Decode every event, or count events from per-partition offsets of consumed batches
+        track_event_times: In offset-delta mode, decode batch boundary events for first/last event times
+        filters: Optional include/exclude rules applied before events are decoded
+        assignment_strategy: Partition assignment strategy of the consumer group
+        static_membership: Join the group with a group.instance.id derived from the replica id
+        session_timeout_ms: How long the group waits for a missing member before rebalancing
     """
     consumer_id: str = Field(..., min_length=1)
     kafka_topic: str = Field(..., min_length=1)
@@ -26,4 +75,88 @@ class ConsumerCreationRequest(BaseModel):
     auto_offset_reset: Optional[OffsetResetStrategy] = Field(
         default=OffsetResetStrategy.EARLIEST,
         description="What to do when there is no initial offset in Kafka"
-    )
\ No newline at end of file
+    )
+    rate_threshold: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Trigger a sync when the pipeline's event rate exceeds this many events/s"
+    )
+    rate_window_seconds: int = Field(
+        default=60,
+        ge=1,
+        le=3600,
+        description="Window, in seconds, over which the event rate is measured"
+    )
+    counting_mode: CountingMode = Field(
+        default=CountingMode.DECODE,
+        description="'offset-delta' counts events without decoding them, for pipelines that only need counts"
+    )
+    track_event_times: bool = Field(
+        default=True,
+        description="In offset-delta mode, decode the first and last event of each batch for Debezium event "
+                    "times instead of using Kafka record timestamps"
+    )
+    filters: Optional[EventFilter] = Field(
+        default=None,
+        description="Only aggregate events that pass these table, op and key rules"
+    )
+    assignment_strategy: Optional[AssignmentStrategy] = Field(
+        default=None,
+        description="'cooperative-sticky' rebalances incrementally instead of revoking every partition"
+    )
+    static_membership: bool = Field(
+        default=False,
+        description="Keep the group membership across restarts of this replica so they do not trigger a rebalance"
+    )
+    session_timeout_ms: Optional[int] = Field(
+        default=None,
+        ge=6000,
+        le=300000,
+        description="Must cover a restart when static membership is used (librdkafka default: 45000)"
+    )
+
+class ReplayRequest(BaseModel):
+    """
+    Request model for rebuilding a pipeline's aggregation state from the events retained in Kafka.
+
+    Attributes:
+        kafka_topic: Topic holding the pipeline's change events
+        pipeline_name: Pipeline whose Redis aggregate is rebuilt
+        start_time: Replay events from this time on (usually the last sync)
+        end_time: Stop at this time; defaults to the end of the topic when the replay starts
+        parallelism: Maximum number of partitions read concurrently
+        consumer_id: Apply the `filters` of this running consumer
+        filters: Include/exclude rules to apply instead of a consumer's
+    """
+    kafka_topic: str = Field(..., min_length=1)
+    pipeline_name: str = Field(..., min_length=1)
+    start_time: datetime = Field(..., description="ISO-8601 time or epoch; naive values are taken as UTC")
+    end_time: Optional[datetime] = Field(default=None, description="Defaults to the end of the topic")
+    parallelism: int = Field(default=8, ge=1, le=64)
+    consumer_id: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        description="Only aggregate the events the filters of this running consumer let through"
+    )
+    filters: Optional[EventFilter] = Field(
+        default=None,
+        description="Only aggregate events that pass these table, op and key rules"
+    )
+
+    @root_validator(skip_on_failure=True)
+    def validate_time_range(cls, values):
+        start_time, end_time = values.get("start_time"), values.get("end_time")
+        if end_time is not None and _as_utc(end_time) <= _as_utc(start_time):
+            raise ValueError("end_time must be after start_time")
+        if values.get("consumer_id") is not None and values.get("filters") is not None:
+            raise ValueError("Pass either consumer_id or filters, not both")
+        return values
+
+    def start_time_ms(self) -> int:
+        return int(_as_utc(self.start_time).timestamp() * 1000)
+
+    def end_time_ms(self) -> Optional[int]:
+        return int(_as_utc(self.end_time).timestamp() * 1000) if self.end_time else None
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -1,12 +1,262 @@
+import math
+import re
 from pydantic import BaseModel, Field, validator, root_validator
-from typing import Optional
+from typing import Optional, Dict, List
 from enum import Enum
+from model.topic import TopicCompressionType
 
 class DatabaseType(str, Enum):
     POSTGRES = "postgres"
     MYSQL = "mysql"
     SQLSERVER = "sqlserver"
 
+CONNECTOR_CLASSES = {
+    "io.debezium.connector.postgresql.PostgresConnector": DatabaseType.POSTGRES,
+    "io.debezium.connector.mysql.MySqlConnector": DatabaseType.MYSQL,
+    "io.debezium.connector.sqlserver.SqlServerConnector": DatabaseType.SQLSERVER,
+}
+
+# Header carrying the change event's `op` code, set by the `eventHeaders` transform (see
+# DebeziumConnectorPayload.event_header_config) so consumers can filter without decoding the value.
+OP_HEADER = "__op"
+
+class ConnectorState(str, Enum):
+    UNASSIGNED = "UNASSIGNED"
+    RUNNING = "RUNNING"
+    PAUSED = "PAUSED"
+    FAILED = "FAILED"
+    RESTARTING = "RESTARTING"
+    STOPPED = "STOPPED"
+
+class TuningProfile(str, Enum):
+    BULK_SNAPSHOT = "bulk-snapshot"
+    BALANCED = "balanced"
+    LOW_LATENCY_STREAMING = "low-latency-streaming"
+
+class CompressionType(str, Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    SNAPPY = "snappy"
+    LZ4 = "lz4"
+    ZSTD = "zstd"
+
+class DebeziumTuning(BaseModel):
+    """
+    Throughput settings for a Debezium connector. Unset fields keep the connector defaults.
+    Producer settings are sent as `producer.override.*` and require the Connect worker to allow
+    client config overrides.
+    """
+    max_batch_size: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of events processed per batch (max.batch.size)"
+    )
+    max_queue_size: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Capacity of the blocking queue between the database reader and Kafka (max.queue.size)"
+    )
+    max_queue_size_in_bytes: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Queue capacity in bytes, 0 disables the bound (max.queue.size.in.bytes)"
+    )
+    poll_interval_ms: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Wait time for new change events when the queue is empty (poll.interval.ms)"
+    )
+    snapshot_fetch_size: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Rows read per round trip while snapshotting (snapshot.fetch.size)"
+    )
+    snapshot_max_threads: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=64,
+        description="Tables snapshotted in parallel (snapshot.max.threads)"
+    )
+    producer_compression_type: Optional[CompressionType] = Field(
+        default=None,
+        description="Producer compression codec (producer.override.compression.type)"
+    )
+    producer_linger_ms: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Producer batching delay (producer.override.linger.ms)"
+    )
+    producer_batch_size: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Producer batch size in bytes (producer.override.batch.size)"
+    )
+
+    @root_validator(skip_on_failure=True)
+    def validate_queue_size(cls, values):
+        max_batch_size, max_queue_size = values.get("max_batch_size"), values.get("max_queue_size")
+        if max_batch_size and max_queue_size and max_queue_size <= max_batch_size:
+            raise ValueError("max_queue_size must be greater than max_batch_size")
+        return values
+
+    @staticmethod
+    def _connector_key(field_name: str) -> str:
+        if field_name.startswith("producer_"):
+            field_name = "producer.override." + field_name[len("producer_"):]
+        return field_name.replace("_", ".")
+
+    @classmethod
+    def connector_keys(cls) -> List[str]:
+        """Kafka Connect properties managed by tuning."""
+        return [cls._connector_key(field_name) for field_name in cls.model_fields]
+
+    def to_connector_config(self) -> Dict[str, str]:
+        """Returns the tuning as Kafka Connect configuration properties."""
+        return {
+            self._connector_key(key): str(value.value if isinstance(value, Enum) else value)
+            for key, value in self.dict(exclude_none=True).items()
+        }
+
+TUNING_PROFILES = {
+    TuningProfile.BULK_SNAPSHOT: {
+        "max_batch_size": 8192,
+        "max_queue_size": 32768,
+        "max_queue_size_in_bytes": 268435456,
+        "poll_interval_ms": 500,
+        "snapshot_fetch_size": 20000,
+        "snapshot_max_threads": 4,
+        "producer_compression_type": CompressionType.LZ4,
+        "producer_linger_ms": 50,
+        "producer_batch_size": 524288,
+    },
+    TuningProfile.BALANCED: {
+        "max_batch_size": 4096,
+        "max_queue_size": 16384,
+        "max_queue_size_in_bytes": 134217728,
+        "poll_interval_ms": 100,
+        "snapshot_fetch_size": 10000,
+        "snapshot_max_threads": 2,
+        "producer_compression_type": CompressionType.LZ4,
+        "producer_linger_ms": 10,
+        "producer_batch_size": 131072,
+    },
+    TuningProfile.LOW_LATENCY_STREAMING: {
+        "max_batch_size": 512,
+        "max_queue_size": 2048,
+        "poll_interval_ms": 10,
+        "producer_compression_type": CompressionType.LZ4,
+        "producer_linger_ms": 0,
+        "producer_batch_size": 16384,
+    },
+}
+
+def resolve_tuning(database_type: DatabaseType, profile: Optional[TuningProfile] = None,
+                   overrides: Optional[DebeziumTuning] = None) -> Optional[DebeziumTuning]:
+    """
+    Expands a tuning profile for the given database and applies explicit overrides on top.
+    Returns None when neither a profile nor overrides are given.
+    """
+    if profile is None and overrides is None:
+        return None
+
+    settings = dict(TUNING_PROFILES[profile]) if profile else {}
+    if database_type == DatabaseType.MYSQL:
+        # MySQL Connector/J ignores the fetch size unless cursor fetching is enabled and
+        # Debezium streams snapshot rows by default, so the profile value is not applied.
+        settings.pop("snapshot_fetch_size", None)
+    if overrides is not None:
+        settings.update(overrides.dict(exclude_none=True))
+    return DebeziumTuning(**settings)
+
+class ProvisioningMode(str, Enum):
+    PRE_CREATE = "pre-create"
+    TOPIC_CREATION_GROUPS = "topic-creation-groups"
+
+class TableSizeHint(BaseModel):
+    """Expected load of one captured table, used to size its change topic"""
+    events_per_second: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Expected change events per second"
+    )
+    size_bytes: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Expected data retained in the topic, e.g. the table size for the initial snapshot"
+    )
+    partitions: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Explicit partition count, takes precedence over the estimates"
+    )
+
+class TopicProvisioning(BaseModel):
+    """
+    Sizing of the per-table change topics of a connector. Topics are either created up front through the
+    topic service (`pre-create`) or described to Kafka Connect as `topic.creation.*` groups.
+    """
+    mode: ProvisioningMode = Field(
+        default=ProvisioningMode.PRE_CREATE,
+        description="How topics are provisioned"
+    )
+    default_partitions: int = Field(
+        default=1,
+        ge=1,
+        description="Partitions for tables without a size hint"
+    )
+    replication_factor: int = Field(
+        default=1,
+        ge=1,
+        description="Replication factor of the change topics"
+    )
+    partition_throughput: float = Field(
+        default=1000,
+        gt=0,
+        description="Events per second a single partition is sized for"
+    )
+    partition_size_bytes: int = Field(
+        default=1073741824,
+        gt=0,
+        description="Data per partition the topics are sized for"
+    )
+    max_partitions: int = Field(
+        default=64,
+        ge=1,
+        description="Upper bound for computed partition counts"
+    )
+    retention_ms: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Retention time of the change topics"
+    )
+    retention_bytes: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Retention size per partition of the change topics"
+    )
+    compression_type: Optional[TopicCompressionType] = Field(
+        default=None,
+        description="Topic compression, defaults to the tuning profile producer compression"
+    )
+    table_hints: Dict[str, TableSizeHint] = Field(
+        default_factory=dict,
+        example={"public.orders": {"events_per_second": 5000}},
+        description="Size hints keyed by table as written in table_include_list"
+    )
+
+    def partitions_for(self, table: str) -> int:
+        hint = self.table_hints.get(table)
+        if hint is None:
+            return self.default_partitions
+        if hint.partitions is not None:
+            return hint.partitions
+        estimates = [self.default_partitions]
+        if hint.events_per_second is not None:
+            estimates.append(math.ceil(hint.events_per_second / self.partition_throughput))
+        if hint.size_bytes is not None:
+            estimates.append(math.ceil(hint.size_bytes / self.partition_size_bytes))
+        return min(max(estimates), self.max_partitions)
+
 class DebeziumConfig(BaseModel):
     """
     Configuration model for Debezium connector setup with database-specific parameters.
@@ -90,4 +340,209 @@ class DebeziumConnectorPayload(BaseModel):
     config: DebeziumConfig = Field(
         ...,
         description="Complete configuration for the connector"
-    )
\ No newline at end of file
+    )
+    tuning_profile: Optional[TuningProfile] = Field(
+        default=None,
+        description="Throughput profile expanded into batching, queue, snapshot and producer settings"
+    )
+    tuning: Optional[DebeziumTuning] = Field(
+        default=None,
+        description="Explicit throughput settings applied on top of the profile"
+    )
+    topic_provisioning: Optional[TopicProvisioning] = Field(
+        default=None,
+        description="Right-size the per-table change topics when the connector starts"
+    )
+    event_headers: bool = Field(
+        default=False,
+        description=f"Copy each change event's op code into a '{OP_HEADER}' Kafka header (needs Kafka Connect 3.0+)"
+    )
+
+    @root_validator(skip_on_failure=True)
+    def validate_tuning(cls, values):
+        try:
+            resolve_tuning(
+                CONNECTOR_CLASSES[values["config"].connector_class],
+                values.get("tuning_profile"),
+                values.get("tuning")
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid tuning: {e}")
+        return values
+
+    def resolve_tuning(self) -> Optional[DebeziumTuning]:
+        return resolve_tuning(CONNECTOR_CLASSES[self.config.connector_class], self.tuning_profile, self.tuning)
+
+    def included_tables(self) -> List[str]:
+        """Entries of table_include_list, or the hinted tables when no include list is set."""
+        if self.config.table_include_list:
+            return [table.strip() for table in self.config.table_include_list.split(",") if table.strip()]
+        if self.topic_provisioning:
+            return list(self.topic_provisioning.table_hints)
+        return []
+
+    def topic_compression(self) -> Optional[TopicCompressionType]:
+        """Topic compression from the provisioning settings, falling back to the tuning producer codec."""
+        if self.topic_provisioning and self.topic_provisioning.compression_type:
+            return self.topic_provisioning.compression_type
+        tuning = self.resolve_tuning()
+        if tuning is None or tuning.producer_compression_type is None:
+            return None
+        if tuning.producer_compression_type == CompressionType.NONE:
+            return TopicCompressionType.UNCOMPRESSED
+        return TopicCompressionType(tuning.producer_compression_type.value)
+
+    def topic_creation_config(self) -> Dict[str, str]:
+        """
+        Builds Kafka Connect `topic.creation.*` properties: a default group plus one group per
+        distinct partition count among the included tables.
+        """
+        provisioning = self.topic_provisioning
+        topic_settings = {"replication.factor": str(provisioning.replication_factor)}
+        if provisioning.retention_ms is not None:
+            topic_settings["retention.ms"] = str(provisioning.retention_ms)
+        if provisioning.retention_bytes is not None:
+            topic_settings["retention.bytes"] = str(provisioning.retention_bytes)
+        compression = self.topic_compression()
+        if compression is not None:
+            topic_settings["compression.type"] = compression.value
+
+        config = {f"topic.creation.default.{key}": value for key, value in topic_settings.items()}
+        config["topic.creation.default.partitions"] = str(provisioning.default_partitions)
+
+        groups = {}
+        prefix = re.escape(self.config.topic_prefix)
+        for table in self.included_tables():
+            partitions = provisioning.partitions_for(table)
+            if partitions != provisioning.default_partitions:
+                # Include list entries are already regular expressions matched against schema.table.
+                groups.setdefault(partitions, []).append(f"{prefix}\\.{table}")
+
+        group_names = []
+        for partitions, patterns in sorted(groups.items()):
+            group = f"partitions{partitions}"
+            group_names.append(group)
+            config[f"topic.creation.{group}.include"] = ",".join(patterns)
+            config[f"topic.creation.{group}.partitions"] = str(partitions)
+            for key, value in topic_settings.items():
+                config[f"topic.creation.{group}.{key}"] = value
+        if group_names:
+            config["topic.creation.groups"] = ",".join(group_names)
+        return config
+
+    def event_header_config(self) -> Dict[str, str]:
+        """
+        Builds the transform that copies the envelope's `op` field into a header. Tombstones carry no value
+        and are skipped by the predicate. The table needs no header, since it is part of the topic name.
+
+        HeaderFrom fails the task on any other record without an `op` field, and a transform takes a single
+        predicate, so MySQL and SQL Server schema change events (on by default) are switched off.
+        """
+        config = {
+            "transforms": "eventHeaders",
+            "transforms.eventHeaders.type": "org.apache.kafka.connect.transforms.HeaderFrom$Value",
+            "transforms.eventHeaders.fields": "op",
+            "transforms.eventHeaders.headers": OP_HEADER,
+            "transforms.eventHeaders.operation": "copy",
+            "transforms.eventHeaders.predicate": "isTombstone",
+            "transforms.eventHeaders.negate": "true",
+            "predicates": "isTombstone",
+            "predicates.isTombstone.type": "org.apache.kafka.connect.transforms.predicates.RecordIsTombstone",
+        }
+        if CONNECTOR_CLASSES[self.config.connector_class] != DatabaseType.POSTGRES:
+            config["include.schema.changes"] = "false"
+        return config
+
+class ConnectorTuningUpdate(BaseModel):
+    """
+    Payload for applying a tuning profile and/or explicit settings to a running connector
+    """
+    tuning_profile: Optional[TuningProfile] = Field(
+        default=None,
+        description="Throughput profile to apply"
+    )
+    tuning: Optional[DebeziumTuning] = Field(
+        default=None,
+        description="Explicit throughput settings applied on top of the profile"
+    )
+
+    @root_validator(skip_on_failure=True)
+    def validate_not_empty(cls, values):
+        if values.get("tuning_profile") is None and values.get("tuning") is None:
+            raise ValueError("Either tuning_profile or tuning must be provided")
+        return values
+
+class SnapshotType(str, Enum):
+    INCREMENTAL = "incremental"
+    BLOCKING = "blocking"
+
+class SignalingSetupRequest(BaseModel):
+    """
+    Payload for enabling Kafka signaling on an existing connector
+    """
+    signal_topic: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        description="Single-partition topic the connector reads signals from, defaults to '<topic_prefix>-signal'"
+    )
+    signal_data_collection: Optional[str] = Field(
+        default=None,
+        example="public.debezium_signal",
+        description="Signaling table used for incremental snapshot watermarks"
+    )
+    incremental_snapshot_chunk_size: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Rows fetched per incremental snapshot chunk"
+    )
+
+class SnapshotCondition(BaseModel):
+    """Row filter restricting which rows of a table are re-snapshotted"""
+    data_collection: str = Field(
+        ...,
+        min_length=1,
+        example="public.orders",
+        description="Table the filter applies to"
+    )
+    filter: str = Field(
+        ...,
+        min_length=1,
+        example="updated_at > '2024-01-01'",
+        description="SQL condition appended to the snapshot query"
+    )
+
+class IncrementalSnapshotRequest(BaseModel):
+    """
+    Payload for re-snapshotting selected tables of a running connector
+    """
+    data_collections: List[str] = Field(
+        ...,
+        min_length=1,
+        example=["public.orders"],
+        description="Tables to snapshot"
+    )
+    additional_conditions: Optional[List[SnapshotCondition]] = Field(
+        default=None,
+        description="Optional per-table row filters"
+    )
+    snapshot_type: SnapshotType = Field(
+        default=SnapshotType.INCREMENTAL,
+        description="Incremental snapshots run alongside streaming, blocking snapshots pause it"
+    )
+
+    @root_validator(skip_on_failure=True)
+    def validate_conditions(cls, values):
+        collections = set(values.get("data_collections") or [])
+        for condition in values.get("additional_conditions") or []:
+            if condition.data_collection not in collections:
+                raise ValueError(f"Condition for '{condition.data_collection}' does not match any data collection")
+        return values
+
+class StopSnapshotRequest(BaseModel):
+    """
+    Payload for stopping an incremental snapshot, for all tables when none are listed
+    """
+    data_collections: Optional[List[str]] = Field(
+        default=None,
+        description="Tables to remove from the running snapshot"
+    )
@@ -1,5 +1,14 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
+from enum import Enum
+
+class TopicCompressionType(str, Enum):
+    PRODUCER = "producer"
+    UNCOMPRESSED = "uncompressed"
+    GZIP = "gzip"
+    SNAPPY = "snappy"
+    LZ4 = "lz4"
+    ZSTD = "zstd"
 
 class TopicManagementBase(BaseModel):
     """Base model for topic-related requests"""
@@ -34,6 +43,10 @@ class CreateTopicRequest(TopicManagementBase):
         ge=0,
         description="Retention size in bytes (1GB)"
     )
+    compression_type: Optional[TopicCompressionType] = Field(
+        default=None,
+        description="Topic-level compression codec, broker default when unset"
+    )
 
 class UpdateTopicRequest(TopicManagementBase):
     """
@@ -50,10 +63,70 @@ class UpdateTopicRequest(TopicManagementBase):
         description="New retention size in bytes"
     )
 
+class ExpandPartitionsRequest(TopicManagementBase):
+    """
+    Request model for growing the partition count of an existing topic
+    """
+    num_partitions: int = Field(
+        ...,
+        ge=1,
+        description="New total number of partitions, must exceed the current count"
+    )
+
+class PartitionRecommendationRequest(TopicManagementBase):
+    """
+    Request model for computing a partition count from producer rate and consumer throughput
+    """
+    consumer_throughput_per_partition: float = Field(
+        ...,
+        gt=0,
+        description="Events per second one consumer can process from a single partition"
+    )
+    producer_rate: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Producer rate in events per second, measured from the topic watermarks when omitted"
+    )
+    headroom: float = Field(
+        default=1.5,
+        ge=1,
+        description="Safety factor applied to the producer rate"
+    )
+    sample_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        le=60,
+        description="Sampling window used to measure the producer rate"
+    )
+
 class TopicInfoRequest(TopicManagementBase):
     """Request model for retrieving topic information"""
     pass
 
 class DeleteTopicRequest(TopicManagementBase):
     """Request model for deleting topics"""
-    pass
\ No newline at end of file
+    pass
+
+class BulkCreateTopicsRequest(BaseModel):
+    """Request model for creating many topics in a single admin batch"""
+    topics: List[CreateTopicRequest] = Field(
+        ...,
+        min_length=1,
+        description="Topics to create"
+    )
+
+class BulkUpdateTopicsRequest(BaseModel):
+    """Request model for updating retention policies of many topics in a single admin batch"""
+    topics: List[UpdateTopicRequest] = Field(
+        ...,
+        min_length=1,
+        description="Topics to update"
+    )
+
+class BulkDeleteTopicsRequest(BaseModel):
+    """Request model for deleting many topics in a single admin batch"""
+    topic_names: List[str] = Field(
+        ...,
+        min_length=1,
+        description="Names of the topics to delete"
+    )
@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from core.config import settings
-from services.consumer import KafkaConsumerService
+from core.jobs import run_or_submit
+from core.scheduler import CooperativeScheduler
+from services.consumer import KafkaConsumerService, ReplayProgress
 from functools import lru_cache
-from model.consumer import ConsumerCreationRequest  
+from model.consumer import ConsumerCreationRequest, ReplayRequest
 
 router = APIRouter(prefix="/consumer", tags=["consumer"])
 
 
 @lru_cache()
 def get_kafka_service_singleton() -> KafkaConsumerService:
-    return KafkaConsumerService(settings.KAFKA_BROKER)
+    scheduler = CooperativeScheduler(
+        workers=settings.CONSUMER_SCHEDULER_WORKERS,
+        time_slice=settings.CONSUMER_TIME_SLICE_MS / 1000,
+        idle_backoff_max=settings.CONSUMER_IDLE_BACKOFF_MS / 1000
+    )
+    return KafkaConsumerService(
+        settings.KAFKA_BROKER, settings.CONSUMER_REPLICA_ID, scheduler, settings.CONSUMER_QUEUED_MAX_KBYTES
+    )
 
 def get_kafka_service(
     kafka_service: KafkaConsumerService = Depends(get_kafka_service_singleton)
@@ -123,4 +133,39 @@ def get_consumer_info(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch consumer info: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post(
+    "/replay",
+    response_model=dict,
+    responses={
+        status.HTTP_200_OK: {"description": "Aggregation state rebuilt"},
+        status.HTTP_202_ACCEPTED: {"description": "Replay accepted as a background job"},
+        status.HTTP_404_NOT_FOUND: {"description": "Topic not found"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to replay events"},
+        status.HTTP_504_GATEWAY_TIMEOUT: {"description": "Some partitions were not read to their end offset"}
+    }
+)
+async def replay_pipeline(
+    request: ReplayRequest,
+    response: Response,
+    background: bool = True,
+    kafka_service: KafkaConsumerService = Depends(get_kafka_service)
+):
+    """Rebuilds a pipeline's Redis aggregate from the events retained in Kafka since `start_time`."""
+    try:
+        progress = ReplayProgress()
+        return await run_or_submit(
+            "consumer.replay",
+            asyncio.to_thread(kafka_service.replay_pipeline, request, progress),
+            background,
+            response,
+            progress.snapshot
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to replay events: {str(e)}"
+        )
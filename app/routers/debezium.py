@@ -1,25 +1,40 @@
-from fastapi import APIRouter, HTTPException, status
-from services.debezium import DebeziumService
-from model.debezium import DebeziumConnectorPayload
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Response, status
+from core.config import settings
+from core.jobs import run_or_submit
+from services.debezium import DebeziumService, ConnectorStateError
+from model.debezium import (
+    DebeziumConnectorPayload, ConnectorState, ConnectorTuningUpdate,
+    SignalingSetupRequest, IncrementalSnapshotRequest, StopSnapshotRequest
+)
+from routers.topic import get_kafka_service_singleton
 
 router = APIRouter(prefix="/debezium", tags=["Debezium"])
 
-debezium_service = DebeziumService()
+debezium_service = DebeziumService(topic_service=get_kafka_service_singleton())
 
 @router.post(
     "/start/",
     status_code=status.HTTP_201_CREATED,
     responses={
         status.HTTP_201_CREATED: {"description": "Debezium connector successfully started"},
+        status.HTTP_202_ACCEPTED: {"description": "Connector creation scheduled as a background job"},
         status.HTTP_400_BAD_REQUEST: {"description": "Invalid connector configuration"},
         status.HTTP_409_CONFLICT: {"description": "Connector with the same name already exists"},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to start Debezium connector"}
     }
 )
-def start_producer(connector_payload: DebeziumConnectorPayload):
+async def start_producer(connector_payload: DebeziumConnectorPayload, response: Response, background: bool = False):
     """Starts a new Debezium connector with the provided configuration."""
     try:
-        return debezium_service.start_producer_debezium(connector_payload=connector_payload)
+        return await run_or_submit(
+            "debezium.start",
+            debezium_service.start_producer_debezium(connector_payload=connector_payload),
+            background,
+            response
+        )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -38,16 +53,36 @@ def start_producer(connector_payload: DebeziumConnectorPayload):
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to fetch Debezium connectors"}
     }
 )
-def list_debezium_connectors():
+async def list_debezium_connectors():
     """Lists all active Debezium connectors."""
     try:
-        return debezium_service.list_debezium_connectors()
+        return await debezium_service.list_debezium_connectors()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch Debezium connectors: {str(e)}"
         )
 
+@router.get(
+    "/fleet/",
+    responses={
+        status.HTTP_200_OK: {"description": "Successfully retrieved connector fleet status"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to fetch connector fleet status"}
+    }
+)
+async def get_connector_fleet(response: Response, state: Optional[ConnectorState] = None, include_config: bool = True):
+    """Returns the state, worker and task status of every connector in one Kafka Connect call."""
+    try:
+        fleet = await debezium_service.get_connector_fleet(state=state, include_config=include_config)
+        if "error" not in fleet:
+            response.headers["Cache-Control"] = f"max-age={int(settings.DEBEZIUM_CACHE_TTL)}"
+        return fleet
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch connector fleet status: {str(e)}"
+        )
+
 @router.get(
     "/connector/{connector_name}/info/",
     responses={
@@ -56,22 +91,56 @@ def list_debezium_connectors():
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to fetch connector info"}
     }
 )
-def get_connector_info(connector_name: str):
+async def get_connector_info(connector_name: str):
     """Fetches information about a specific Debezium connector."""
     try:
-        connector_info = debezium_service.get_debezium_connector_info(connector_name=connector_name)
+        connector_info = await debezium_service.get_debezium_connector_info(connector_name=connector_name)
         if not connector_info:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Connector '{connector_name}' not found"
             )
         return connector_info
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch connector info: {str(e)}"
         )
 
+@router.put(
+    "/connector/{connector_name}/tuning/",
+    responses={
+        status.HTTP_200_OK: {"description": "Tuning successfully applied to the connector"},
+        status.HTTP_404_NOT_FOUND: {"description": "Connector not found"},
+        status.HTTP_409_CONFLICT: {"description": "Connector is not a supported Debezium connector"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to apply connector tuning"}
+    }
+)
+async def update_connector_tuning(connector_name: str, tuning_update: ConnectorTuningUpdate):
+    """Applies a throughput tuning profile and/or explicit settings to a running Debezium connector."""
+    try:
+        result = await debezium_service.update_connector_tuning(connector_name=connector_name, tuning_update=tuning_update)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Connector '{connector_name}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except ConnectorStateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to apply connector tuning: {str(e)}"
+        )
+
 @router.delete(
     "/connector/{connector_name}/delete/",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -81,18 +150,177 @@ def get_connector_info(connector_name: str):
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to delete connector"}
     }
 )
-def stop_connector(connector_name: str):
+async def stop_connector(connector_name: str):
     """Stops and deletes a specific Debezium connector."""
     try:
-        if not debezium_service.get_debezium_connector_info(connector_name=connector_name):
+        if not await debezium_service.delete_debezium_connector(connector_name=connector_name):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Connector '{connector_name}' not found"
             )
-        debezium_service.delete_debezium_connector(connector_name=connector_name)
         return  # No content for 204 responses
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete connector: {str(e)}"
-        )
\ No newline at end of file
+        )
+@router.post(
+    "/connector/{connector_name}/signaling/",
+    responses={
+        status.HTTP_200_OK: {"description": "Signaling successfully enabled"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Connector has no topic prefix and no signal topic was given"},
+        status.HTTP_404_NOT_FOUND: {"description": "Connector not found"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to enable signaling"}
+    }
+)
+async def enable_signaling(connector_name: str, setup: SignalingSetupRequest):
+    """Enables Kafka signaling on a connector, creating its signal topic if needed."""
+    try:
+        result = await debezium_service.enable_signaling(connector_name=connector_name, setup=setup)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Connector '{connector_name}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to enable signaling: {str(e)}"
+        )
+
+@router.post(
+    "/connector/{connector_name}/snapshot/",
+    responses={
+        status.HTTP_200_OK: {"description": "Snapshot signal sent"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Connector has no topic prefix"},
+        status.HTTP_404_NOT_FOUND: {"description": "Connector not found"},
+        status.HTTP_409_CONFLICT: {"description": "Kafka signaling is not enabled for the connector"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to send snapshot signal"}
+    }
+)
+async def execute_snapshot(connector_name: str, snapshot: IncrementalSnapshotRequest):
+    """Triggers an incremental snapshot of selected tables, optionally filtered."""
+    try:
+        result = await debezium_service.execute_snapshot(connector_name=connector_name, snapshot=snapshot)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Connector '{connector_name}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except ConnectorStateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to send snapshot signal: {str(e)}"
+        )
+
+@router.post(
+    "/connector/{connector_name}/snapshot/stop/",
+    responses={
+        status.HTTP_200_OK: {"description": "Stop signal sent"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Connector has no topic prefix"},
+        status.HTTP_404_NOT_FOUND: {"description": "Connector not found"},
+        status.HTTP_409_CONFLICT: {"description": "Kafka signaling is not enabled for the connector"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to send stop signal"}
+    }
+)
+async def stop_snapshot(connector_name: str, stop: StopSnapshotRequest):
+    """Stops the running incremental snapshot, for all or selected tables."""
+    try:
+        result = await debezium_service.stop_snapshot(connector_name=connector_name, stop=stop)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Connector '{connector_name}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except ConnectorStateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to send stop signal: {str(e)}"
+        )
+
+@router.post(
+    "/connector/{connector_name}/snapshot/pause/",
+    responses={
+        status.HTTP_200_OK: {"description": "Pause signal sent"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Connector has no topic prefix"},
+        status.HTTP_404_NOT_FOUND: {"description": "Connector not found"},
+        status.HTTP_409_CONFLICT: {"description": "Kafka signaling is not enabled for the connector"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to send pause signal"}
+    }
+)
+async def pause_snapshot(connector_name: str):
+    """Pauses the running incremental snapshot."""
+    try:
+        result = await debezium_service.pause_snapshot(connector_name=connector_name)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Connector '{connector_name}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except ConnectorStateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to send pause signal: {str(e)}"
+        )
+
+@router.post(
+    "/connector/{connector_name}/snapshot/resume/",
+    responses={
+        status.HTTP_200_OK: {"description": "Resume signal sent"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Connector has no topic prefix"},
+        status.HTTP_404_NOT_FOUND: {"description": "Connector not found"},
+        status.HTTP_409_CONFLICT: {"description": "Kafka signaling is not enabled for the connector"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to send resume signal"}
+    }
+)
+async def resume_snapshot(connector_name: str):
+    """Resumes a paused incremental snapshot."""
+    try:
+        result = await debezium_service.resume_snapshot(connector_name=connector_name)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Connector '{connector_name}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except ConnectorStateError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to send resume signal: {str(e)}"
+        )
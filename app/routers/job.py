@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, status
+from core.jobs import job_manager
+
+router = APIRouter(prefix="/job", tags=["jobs"])
+
+@router.get(
+    "/list",
+    responses={
+        status.HTTP_200_OK: {"description": "Successfully retrieved list of jobs"}
+    }
+)
+async def list_jobs():
+    """Lists background jobs that are running or finished recently."""
+    return {"jobs": job_manager.list()}
+
+@router.get(
+    "/{job_id}",
+    responses={
+        status.HTTP_200_OK: {"description": "Successfully retrieved job status"},
+        status.HTTP_404_NOT_FOUND: {"description": "Job not found"}
+    }
+)
+async def get_job(job_id: str):
+    """Returns the status and, once finished, the result or error of a background job."""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found"
+        )
+    return job
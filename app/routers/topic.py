@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from services.topic import KafkaTopicService
 from core.config import settings
-from model.topic import CreateTopicRequest, UpdateTopicRequest, TopicInfoRequest, DeleteTopicRequest
+from core.jobs import run_or_submit
+from model.topic import (
+    CreateTopicRequest, UpdateTopicRequest, TopicInfoRequest, DeleteTopicRequest,
+    BulkCreateTopicsRequest, BulkUpdateTopicsRequest, BulkDeleteTopicsRequest,
+    ExpandPartitionsRequest, PartitionRecommendationRequest
+)
 from functools import lru_cache
 
 router = APIRouter(prefix="/topic", tags=["topics"])
@@ -10,7 +16,11 @@ router = APIRouter(prefix="/topic", tags=["topics"])
 
 @lru_cache()
 def get_kafka_service_singleton() -> KafkaTopicService:
-    return KafkaTopicService(settings.KAFKA_BROKER)
+    return KafkaTopicService(
+        settings.KAFKA_BROKER,
+        metadata_ttl=settings.KAFKA_METADATA_CACHE_TTL,
+        inventory_ttl=settings.KAFKA_INVENTORY_CACHE_TTL
+    )
 
 def get_kafka_service(
     kafka_service: KafkaTopicService = Depends(get_kafka_service_singleton)
@@ -24,16 +34,53 @@ def get_kafka_service(
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to fetch topics from Kafka broker"}
     }
 )
-def list_topics(topic_service: KafkaTopicService = Depends(get_kafka_service)):
-    """Fetches all Kafka topics available in the broker."""
+async def list_topics(refresh: bool = False, topic_service: KafkaTopicService = Depends(get_kafka_service)):
+    """Fetches all Kafka topics available in the broker. Set `refresh` to bypass the metadata cache."""
     try:
-        return topic_service.list_topics()
+        return await topic_service.list_topics(refresh=refresh)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch topics: {str(e)}"
         )
 
+@router.get(
+    "/inventory",
+    responses={
+        status.HTTP_200_OK: {"description": "Successfully retrieved topic inventory"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid filter"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to fetch topic inventory"}
+    }
+)
+async def get_topic_inventory(
+    prefix: Optional[str] = None,
+    pattern: Optional[str] = Query(default=None, description="Regular expression matched against topic names"),
+    include_internal: bool = False,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    refresh: bool = False,
+    topic_service: KafkaTopicService = Depends(get_kafka_service)
+):
+    """Lists topics with partition, replication and watermark statistics, filtered and paginated."""
+    try:
+        return await topic_service.get_topic_inventory(
+            prefix=prefix,
+            pattern=pattern,
+            include_internal=include_internal,
+            offset=offset,
+            limit=limit,
+            refresh=refresh
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch topic inventory: {str(e)}"
+        )
+
 @router.post(
     "/config",
     responses={
@@ -42,16 +89,18 @@ def list_topics(topic_service: KafkaTopicService = Depends(get_kafka_service)):
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to fetch topic configuration"}
     }
 )
-def get_topic_config(request: TopicInfoRequest, topic_service: KafkaTopicService = Depends(get_kafka_service)):
+async def get_topic_config(request: TopicInfoRequest, topic_service: KafkaTopicService = Depends(get_kafka_service)):
     """Fetches the configuration of a specific Kafka topic."""
     try:
-        config = topic_service.get_topic_config(request.topic_name)
+        config = await topic_service.get_topic_config(request.topic_name)
         if not config:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Topic '{request.topic_name}' not found"
             )
         return config
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -64,13 +113,16 @@ def get_topic_config(request: TopicInfoRequest, topic_service: KafkaTopicService
     responses={
         status.HTTP_201_CREATED: {"description": "Topic successfully created"},
         status.HTTP_400_BAD_REQUEST: {"description": "Invalid topic configuration"},
+        status.HTTP_409_CONFLICT: {"description": "Topic already exists"},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to create topic"}
     }
 )
-def create_topic(request: CreateTopicRequest, topic_service: KafkaTopicService = Depends(get_kafka_service)):
+async def create_topic(request: CreateTopicRequest, topic_service: KafkaTopicService = Depends(get_kafka_service)):
     """Creates a Kafka topic dynamically with user-defined partitions, replication factor, and retention policies."""
     try:
-        return topic_service.create_topic(request)
+        return await topic_service.create_topic(request)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -86,15 +138,12 @@ def create_topic(request: CreateTopicRequest, topic_service: KafkaTopicService =
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to delete topic"}
     }
 )
-def delete_topic(request: DeleteTopicRequest, topic_service: KafkaTopicService = Depends(get_kafka_service)):
+async def delete_topic(request: DeleteTopicRequest, topic_service: KafkaTopicService = Depends(get_kafka_service)):
     """Deletes a Kafka topic."""
     try:
-        if not topic_service.get_topic_config(request.topic_name):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Topic '{request.topic_name}' not found"
-            )
-        topic_service.delete_topic(request.topic_name)
+        await topic_service.delete_topic(request.topic_name)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -110,17 +159,156 @@ def delete_topic(request: DeleteTopicRequest, topic_service: KafkaTopicService =
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to update topic"}
     }
 )
-def update_topic(request: UpdateTopicRequest, topic_service: KafkaTopicService = Depends(get_kafka_service)):
+async def update_topic(request: UpdateTopicRequest, topic_service: KafkaTopicService = Depends(get_kafka_service)):
     """Updates the retention policies of an existing Kafka topic."""
     try:
-        if not topic_service.get_topic_config(request.topic_name):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Topic '{request.topic_name}' not found"
-            )
-        return topic_service.update_topic(request)
+        return await topic_service.update_topic(request)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update topic: {str(e)}"
         )
+
+
+@router.post(
+    "/bulk/create",
+    responses={
+        status.HTTP_200_OK: {"description": "Batch processed, see per-topic results"},
+        status.HTTP_202_ACCEPTED: {"description": "Operation scheduled as a background job"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid batch"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to create topics"}
+    }
+)
+async def create_topics(
+    request: BulkCreateTopicsRequest,
+    response: Response,
+    background: bool = False,
+    topic_service: KafkaTopicService = Depends(get_kafka_service)
+):
+    """Creates many Kafka topics in a single admin batch. Partial success is reported per topic."""
+    try:
+        return await run_or_submit(
+            "topic.bulk_create", topic_service.create_topics(request.topics), background, response
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create topics: {str(e)}"
+        )
+
+@router.patch(
+    "/bulk/update",
+    responses={
+        status.HTTP_200_OK: {"description": "Batch processed, see per-topic results"},
+        status.HTTP_202_ACCEPTED: {"description": "Operation scheduled as a background job"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid batch"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to update topics"}
+    }
+)
+async def update_topics(
+    request: BulkUpdateTopicsRequest,
+    response: Response,
+    background: bool = False,
+    topic_service: KafkaTopicService = Depends(get_kafka_service)
+):
+    """Updates retention policies of many Kafka topics in a single admin batch."""
+    try:
+        return await run_or_submit(
+            "topic.bulk_update", topic_service.update_topics(request.topics), background, response
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update topics: {str(e)}"
+        )
+
+@router.delete(
+    "/bulk/delete",
+    responses={
+        status.HTTP_200_OK: {"description": "Batch processed, see per-topic results"},
+        status.HTTP_202_ACCEPTED: {"description": "Operation scheduled as a background job"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid batch"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to delete topics"}
+    }
+)
+async def delete_topics(
+    request: BulkDeleteTopicsRequest,
+    response: Response,
+    background: bool = False,
+    topic_service: KafkaTopicService = Depends(get_kafka_service)
+):
+    """Deletes many Kafka topics in a single admin batch."""
+    try:
+        return await run_or_submit(
+            "topic.bulk_delete", topic_service.delete_topics(request.topic_names), background, response
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete topics: {str(e)}"
+        )
+
+@router.patch(
+    "/partitions",
+    responses={
+        status.HTTP_200_OK: {"description": "Topic partitions successfully expanded"},
+        status.HTTP_202_ACCEPTED: {"description": "Operation scheduled as a background job"},
+        status.HTTP_400_BAD_REQUEST: {"description": "Requested partition count does not exceed the current count"},
+        status.HTTP_404_NOT_FOUND: {"description": "Topic not found"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to expand partitions"}
+    }
+)
+async def expand_partitions(
+    request: ExpandPartitionsRequest,
+    response: Response,
+    background: bool = False,
+    topic_service: KafkaTopicService = Depends(get_kafka_service)
+):
+    """Grows the partition count of an existing Kafka topic without downtime."""
+    try:
+        return await run_or_submit(
+            "topic.expand_partitions", topic_service.expand_partitions(request), background, response
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to expand partitions: {str(e)}"
+        )
+
+@router.post(
+    "/partitions/recommendation",
+    responses={
+        status.HTTP_200_OK: {"description": "Successfully computed partition recommendation"},
+        status.HTTP_202_ACCEPTED: {"description": "Operation scheduled as a background job"},
+        status.HTTP_404_NOT_FOUND: {"description": "Topic not found"},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"description": "Failed to compute partition recommendation"}
+    }
+)
+async def recommend_partitions(
+    request: PartitionRecommendationRequest,
+    response: Response,
+    background: bool = False,
+    topic_service: KafkaTopicService = Depends(get_kafka_service)
+):
+    """Suggests a partition count from the producer rate and per-partition consumer throughput."""
+    try:
+        return await run_or_submit(
+            "topic.recommend_partitions", topic_service.recommend_partitions(request), background, response
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute partition recommendation: {str(e)}"
+        )
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import random
+from typing import Optional
+import httpx
+from core.cache import TTLCache
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+
+class KafkaConnectClient:
+    """
+    Shared HTTP client for the Kafka Connect REST API with a bounded keep-alive connection pool,
+    jittered retries for transient errors and a short-lived cache for read requests.
+
+    The httpx.AsyncClient holding the pool is built lazily and released by `aclose` on application
+    shutdown. Any mutating request invalidates the read cache.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 5.0, max_connections: int = 20,
+                 max_keepalive_connections: int = 10, max_retries: int = 3,
+                 backoff_base: float = 0.2, backoff_max: float = 2.0, cache_ttl: float = 2.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self._headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        self._async_client = None
+        self._cache = TTLCache(ttl=cache_ttl)
+        # Bumped by every invalidation; a read only caches its body if no mutation started or finished
+        # while it was in flight.
+        self._generation = 0
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(headers=self._headers, timeout=self.timeout, limits=self._limits)
+        return self._async_client
+
+    def _is_retryable_response(self, method: str, response: httpx.Response) -> bool:
+        # Connect answers 409 both for "already exists" and while the worker group rebalances;
+        # only the latter is transient. Like 429, it means the request was not applied.
+        if response.status_code == 429 or (response.status_code == 409 and "rebalanc" in response.text.lower()):
+            return True
+        # A 5xx to a non-idempotent request may still have been applied (Connect often answers 500 to a
+        # create that succeeds), so only idempotent requests are resent.
+        return method in IDEMPOTENT_METHODS and response.status_code in RETRYABLE_STATUS_CODES
+
+    def _is_retryable_error(self, method: str, error: httpx.TransportError) -> bool:
+        if method in IDEMPOTENT_METHODS:
+            return True
+        # A non-idempotent request is only safe to resend if it never reached the server.
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def invalidate(self):
+        self._generation += 1
+        self._cache.invalidate()
+
+    async def arequest(self, method: str, path: str = "", **kwargs) -> httpx.Response:
+        method = method.upper()
+        if method in ("GET", "HEAD"):
+            return await self._asend(method, path, **kwargs)
+        # Invalidate again once the mutation is answered, so a read that raced with it and cached the
+        # old body is dropped as well.
+        self.invalidate()
+        try:
+            return await self._asend(method, path, **kwargs)
+        finally:
+            self.invalidate()
+
+    async def _asend(self, method: str, path: str, **kwargs) -> httpx.Response:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.get_async_client().request(method, self._url(path), **kwargs)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries or not self._is_retryable_error(method, e):
+                    raise
+                logging.warning(f"Kafka Connect {method} {path or '/'} failed ({e}), retrying")
+            else:
+                if attempt == self.max_retries or not self._is_retryable_response(method, response):
+                    return response
+                logging.warning(f"Kafka Connect {method} {path or '/'} returned {response.status_code}, retrying")
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def aget_json(self, path: str = "", params: Optional[dict] = None):
+        """GETs `path` and returns the decoded body, served from the read cache when fresh. 404 yields None."""
+        cache_key = (path, str(httpx.QueryParams(params or {})))
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+        generation = self._generation
+        response = await self.arequest("GET", path, params=params)
+        return self._store_json(cache_key, response, generation)
+
+    def _store_json(self, cache_key, response: httpx.Response, generation: int):
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        body = response.json()
+        if generation == self._generation:
+            self._cache.set(cache_key, body)
+        return body
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
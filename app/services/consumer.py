@@ -1,29 +1,211 @@
 import json
+import re
+import socket
 import threading
 import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from datetime import datetime, timezone
-from confluent_kafka import Consumer, KafkaError
-from model.consumer import ConsumerCreationRequest
+from typing import Optional
+from confluent_kafka import Consumer, KafkaError, TopicPartition, TIMESTAMP_NOT_AVAILABLE
+from model.consumer import (
+    ConsumerCreationRequest, ReplayRequest, CountingMode, EventFilter, AssignmentStrategy, OffsetResetStrategy
+)
+from model.debezium import OP_HEADER
+from core.rate import SlidingWindowRate
+from core.scheduler import CooperativeScheduler
 from fastapi import HTTPException
 import redis
 
 logging.basicConfig(level=logging.INFO)
 
+COUNT_BATCH_SIZE = 500
+REPLAY_BATCH_SIZE = 1000
+REPLAY_IDLE_POLLS = 3
+
 def handle_exceptions(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}") from e
     return wrapper
 
+class ConsumerTask:
+    """A consumer as scheduled on the CooperativeScheduler; each time slice is run by KafkaConsumerService."""
+
+    def __init__(self, service: 'KafkaConsumerService', consumer_id: str, max_event: int, max_time: int):
+        self.service = service
+        self.consumer_id = consumer_id
+        self.data = service.consumers[consumer_id]
+        self.max_event = max_event
+        self.max_time = max_time
+        self.subscribed = False
+
+    def run_slice(self, deadline: float) -> Optional[bool]:
+        return self.service._consume_slice(self, deadline)
+
+    def __repr__(self):
+        return f"ConsumerTask({self.consumer_id})"
+
+class ConsumerEventFilter:
+    """
+    Compiled EventFilter for one consumer. The table decision is cached per topic, key patterns run on
+    the raw key bytes and the op is read from the op header, so rejected events are never decoded. Only
+    when op rules are set and a message lacks the header is its value decoded; that payload is returned
+    so the event is not decoded twice.
+    """
+
+    def __init__(self, event_filter: EventFilter):
+        self.include_tables = self._compile(event_filter.include_tables)
+        self.exclude_tables = self._compile(event_filter.exclude_tables)
+        self.include_keys = self._compile(event_filter.include_keys, as_bytes=True)
+        self.exclude_keys = self._compile(event_filter.exclude_keys, as_bytes=True)
+        self.include_ops = {op.value for op in event_filter.include_ops} if event_filter.include_ops else None
+        self.exclude_ops = {op.value for op in event_filter.exclude_ops} if event_filter.exclude_ops else None
+        self._op_header = OP_HEADER
+        self._topic_decisions = {}
+        self.stats = {
+            'examined': 0, 'passed': 0, 'dropped_table': 0, 'dropped_key': 0, 'dropped_op': 0,
+            'op_from_header': 0, 'op_from_value': 0
+        }
+
+    def _compile(self, patterns: Optional[list], as_bytes: bool = False) -> Optional[list]:
+        if not patterns:
+            return None
+        return [re.compile(pattern.encode('utf-8') if as_bytes else pattern) for pattern in patterns]
+
+    def _table_allowed(self, topic: str) -> bool:
+        allowed = self._topic_decisions.get(topic)
+        if allowed is None:
+            # Debezium names change topics <prefix>.<schema or db>.<table>.
+            table = ".".join(topic.split(".")[-2:])
+            allowed = (
+                (self.include_tables is None or any(p.fullmatch(table) for p in self.include_tables))
+                and not (self.exclude_tables and any(p.fullmatch(table) for p in self.exclude_tables))
+            )
+            self._topic_decisions[topic] = allowed
+        return allowed
+
+    def _key_allowed(self, key: Optional[bytes]) -> bool:
+        key = key or b''
+        if self.include_keys is not None and not any(p.search(key) for p in self.include_keys):
+            return False
+        return not (self.exclude_keys and any(p.search(key) for p in self.exclude_keys))
+
+    def _read_op(self, msg) -> tuple:
+        for name, value in msg.headers() or ():
+            if name == self._op_header:
+                self.stats['op_from_header'] += 1
+                return (value.decode('utf-8') if value else None), None
+        self.stats['op_from_value'] += 1
+        try:
+            payload = json.loads(msg.value().decode('utf-8')).get('payload') or {}
+        except (ValueError, AttributeError):
+            payload = {}
+        return payload.get('op'), payload
+
+    def evaluate(self, msg) -> tuple:
+        """Returns (passed, payload); payload is set only if the value had to be decoded to read the op."""
+        stats = self.stats
+        stats['examined'] += 1
+        if not self._table_allowed(msg.topic()):
+            stats['dropped_table'] += 1
+            return False, None
+        if (self.include_keys is not None or self.exclude_keys is not None) and not self._key_allowed(msg.key()):
+            stats['dropped_key'] += 1
+            return False, None
+        payload = None
+        if self.include_ops is not None or self.exclude_ops is not None:
+            op, payload = self._read_op(msg)
+            if (self.include_ops is not None and op not in self.include_ops) or (
+                self.exclude_ops is not None and op in self.exclude_ops
+            ):
+                stats['dropped_op'] += 1
+                return False, None
+        stats['passed'] += 1
+        return True, payload
+
+    def report(self) -> dict:
+        stats = dict(self.stats)
+        examined = stats['examined']
+        stats['pass_rate'] = round(stats['passed'] / examined, 4) if examined else None
+        return stats
+
+class ReplayProgress:
+    """Thread-safe progress of a replay, shared by its partition readers."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.partitions = {}
+        self.events_processed = 0
+        self.events_skipped = 0
+        self.events_filtered = 0
+        self._lock = threading.Lock()
+
+    def plan(self, partition: int, start_offset: int, end_offset: int):
+        with self._lock:
+            self.partitions[partition] = {
+                "start_offset": start_offset,
+                "end_offset": end_offset,
+                "position": start_offset,
+                "done": start_offset >= end_offset
+            }
+
+    def advance(self, partition: int, position: int, processed: int, skipped: int, filtered: int = 0):
+        with self._lock:
+            state = self.partitions[partition]
+            state["position"] = position
+            state["done"] = position >= state["end_offset"]
+            self.events_processed += processed
+            self.events_skipped += skipped
+            self.events_filtered += filtered
+
+    def position(self, partition: int) -> int:
+        with self._lock:
+            return self.partitions[partition]["position"]
+
+    def unfinished(self) -> dict:
+        """Partitions whose reader stopped short of the planned end offset."""
+        with self._lock:
+            return {
+                partition: {"position": state["position"], "end_offset": state["end_offset"]}
+                for partition, state in sorted(self.partitions.items()) if not state["done"]
+            }
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = time.monotonic() - self.started_at
+            total = sum(p["end_offset"] - p["start_offset"] for p in self.partitions.values())
+            read = sum(p["position"] - p["start_offset"] for p in self.partitions.values())
+            return {
+                "partitions_total": len(self.partitions),
+                "partitions_done": sum(1 for p in self.partitions.values() if p["done"]),
+                "messages_total": total,
+                "messages_read": read,
+                "percent_complete": round(100.0 * read / total, 2) if total else 100.0,
+                "events_processed": self.events_processed,
+                "events_skipped": self.events_skipped,
+                "events_filtered": self.events_filtered,
+                "elapsed_seconds": round(elapsed, 3),
+                "messages_per_second": round(read / elapsed, 1) if elapsed > 0 else 0.0,
+            }
+
 class KafkaConsumerService:
-    def __init__(self, kafka_broker: str):
+    def __init__(self, kafka_broker: str, replica_id: Optional[str] = None,
+                 scheduler: Optional[CooperativeScheduler] = None, queued_max_kbytes: Optional[int] = None):
         self.kafka_broker = kafka_broker
+        self.replica_id = replica_id or socket.gethostname()
+        self.scheduler = scheduler or CooperativeScheduler()
+        self.queued_max_kbytes = queued_max_kbytes
         self.consumers = {}
         self.consumers_lock = threading.Lock()
+        self.rate_windows = {}
         self.redis_client = redis.StrictRedis(
             host='redis', port=6379, db=0, decode_responses=True
         )
@@ -38,12 +220,23 @@ class KafkaConsumerService:
         }
         return event_type_mapping.get(event_code, 'unknown')
 
-    def _parse_timestamp(self, ts_ms: int) -> tuple:
-        if not ts_ms:
-            return "unknown", "unknown"
-        timestamp_seconds = ts_ms / 1000
-        date_time = datetime.fromtimestamp(timestamp_seconds, tz=timezone.utc)
-        return date_time, date_time.strftime('%Y-%m-%d %H:%M:%S')
+    def _event_time_ms(self, ts_ms) -> Optional[int]:
+        return int(ts_ms) if ts_ms else None
+
+    def _as_epoch_ms(self, value) -> Optional[int]:
+        """Reads an event time stored in Redis, accepting the 'YYYY-MM-DD HH:MM:SS' UTC strings of older releases."""
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            legacy = datetime.strptime(value, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+            return int(legacy.timestamp() * 1000)
+        except (TypeError, ValueError):
+            return None
+
+    def _format_epoch_ms(self, epoch_ms: Optional[int]) -> str:
+        if epoch_ms is None:
+            return "unknown"
+        return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc).isoformat(timespec='milliseconds')
 
     @handle_exceptions
     def start_consumer(self, request: ConsumerCreationRequest):
@@ -52,30 +245,92 @@ class KafkaConsumerService:
                 return {"message": f"Consumer '{request.consumer_id}' already running."}
             
             consumer = self._create_kafka_consumer(request)
-            self._start_consumer_thread(request, consumer)
+            self._schedule_consumer(request, consumer)
             
             return {"message": f"Started consumer '{request.consumer_id}' for topic '{request.kafka_topic}'."}
 
     def _create_kafka_consumer(self, request: ConsumerCreationRequest) -> Consumer:
-        return Consumer({
+        config = {
             'bootstrap.servers': self.kafka_broker,
             'group.id': f'{request.consumer_id}-group',
-            'auto.offset.reset': request.auto_offset_reset
-        })
+            'auto.offset.reset': (request.auto_offset_reset or OffsetResetStrategy.EARLIEST).value
+        }
+        if request.assignment_strategy is not None:
+            config['partition.assignment.strategy'] = request.assignment_strategy.value
+        if request.static_membership:
+            config['group.instance.id'] = f'{request.consumer_id}-{self.replica_id}'
+        if request.session_timeout_ms is not None:
+            config['session.timeout.ms'] = request.session_timeout_ms
+        if self.queued_max_kbytes is not None:
+            config['queued.max.messages.kbytes'] = self.queued_max_kbytes
+        return Consumer(config)
+
+    def _rebalance_callbacks(self, consumer_id: str, cooperative: bool) -> dict:
+        """
+        Builds the subscribe() callbacks that apply rebalances. With cooperative-sticky only the partitions
+        that move are added or removed, and fetching of the others continues undisturbed.
+        """
+        def on_assign(consumer, partitions):
+            if cooperative:
+                consumer.incremental_assign(partitions)
+            else:
+                consumer.assign(partitions)
+            consumer_data = self.consumers.get(consumer_id)
+            if consumer_data is not None:
+                with consumer_data['assignment_lock']:
+                    consumer_data['assignment'].update(tp.partition for tp in partitions)
+            logging.info(f"Consumer {consumer_id} assigned partitions {[tp.partition for tp in partitions]}")
+
+        def on_revoke(consumer, partitions):
+            if cooperative:
+                consumer.incremental_unassign(partitions)
+            else:
+                consumer.unassign()
+            consumer_data = self.consumers.get(consumer_id)
+            if consumer_data is not None:
+                with consumer_data['assignment_lock']:
+                    consumer_data['assignment'].difference_update(tp.partition for tp in partitions)
+                for tp in partitions:
+                    consumer_data['partition_stats'].pop(tp.partition, None)
+            logging.info(f"Consumer {consumer_id} revoked partitions {[tp.partition for tp in partitions]}")
+
+        return {'on_assign': on_assign, 'on_revoke': on_revoke, 'on_lost': on_revoke}
 
-    def _start_consumer_thread(self, request: ConsumerCreationRequest, consumer: Consumer):
+    def _get_rate_window(self, request: ConsumerCreationRequest) -> Optional[SlidingWindowRate]:
+        if request.rate_threshold is None:
+            return None
+        rate_window = self.rate_windows.get(request.pipeline_name)
+        if rate_window is None or rate_window.window_seconds != request.rate_window_seconds:
+            rate_window = SlidingWindowRate(request.rate_window_seconds)
+            self.rate_windows[request.pipeline_name] = rate_window
+        return rate_window
+
+    def _release_rate_window(self, pipeline_name: str):
+        if not any(data['pipeline_name'] == pipeline_name for data in self.consumers.values()):
+            self.rate_windows.pop(pipeline_name, None)
+
+    def _schedule_consumer(self, request: ConsumerCreationRequest, consumer: Consumer):
         self.consumers[request.consumer_id] = {
             'consumer': consumer,
             'running': True,
-            'topic': request.kafka_topic
+            'topic': request.kafka_topic,
+            'pipeline_name': request.pipeline_name,
+            'rate_window': self._get_rate_window(request),
+            'rate_threshold': request.rate_threshold,
+            'counting_mode': request.counting_mode,
+            'track_event_times': request.track_event_times,
+            'partition_stats': {},
+            'filters': request.filters,
+            'event_filter': ConsumerEventFilter(request.filters) if request.filters else None,
+            'cooperative': request.assignment_strategy == AssignmentStrategy.COOPERATIVE_STICKY,
+            'group_instance_id': f'{request.consumer_id}-{self.replica_id}' if request.static_membership else None,
+            'assignment': set(),
+            # on_assign/on_revoke run on a scheduler worker while get_consumer_info reads the set.
+            'assignment_lock': threading.Lock()
         }
-        thread = threading.Thread(
-            target=self._message_consumption_loop,
-            args=(request.consumer_id, request.kafka_topic, request.pipeline_name, request.max_event, request.max_time),
-            daemon=True
-        )
-        self.consumers[request.consumer_id]['thread'] = thread
-        thread.start()
+        task = ConsumerTask(self, request.consumer_id, request.max_event, request.max_time)
+        self.consumers[request.consumer_id]['task'] = task
+        self.scheduler.submit(task)
 
     @handle_exceptions
     def stop_consumer(self, consumer_id: str):
@@ -84,29 +339,82 @@ class KafkaConsumerService:
                 return {"message": f"Consumer '{consumer_id}' not running."}
             
             consumer_data = self.consumers.pop(consumer_id)
-            consumer_data['consumer'].close()
+            # The consumer is closed by the scheduler worker that next runs it, never while it is polled.
+            consumer_data['running'] = False
+            self.scheduler.wake(consumer_data['task'])
+            self._release_rate_window(consumer_data['pipeline_name'])
             return {"message": f"Stopped consumer '{consumer_id}'."}
 
-    def _message_consumption_loop(self, consumer_id: str, topic: str, pipeline_name: str, max_event: int, max_time: int):
-        consumer = self.consumers[consumer_id]['consumer']
-        consumer.subscribe([topic])
+    def _consume_slice(self, task: 'ConsumerTask', deadline: float) -> Optional[bool]:
+        """
+        Runs one scheduler time slice of a consumer: drains what librdkafka has already fetched with
+        non-blocking polls until nothing is buffered or `deadline` passes. Returns whether any message was
+        handled, or None once the consumer has stopped.
+        """
+        data = task.data
+        consumer = data['consumer']
+        if not data['running']:
+            self._close_consumer(task)
+            return None
 
+        topic, pipeline_name = data['topic'], data['pipeline_name']
         try:
-            while self.consumers[consumer_id]['running']:
-                msg = consumer.poll(timeout=1.0)
-                if msg is None:
-                    continue
-                
-                if msg.error():
-                    self._handle_kafka_error(msg.error(), topic)
-                    continue
-                
-                self._process_message(msg, pipeline_name, max_event, max_time)
+            if not task.subscribed:
+                consumer.subscribe([topic], **self._rebalance_callbacks(task.consumer_id, data['cooperative']))
+                task.subscribed = True
+
+            handled = 0
+            offset_delta = data['counting_mode'] == CountingMode.OFFSET_DELTA
+            event_filter = data['event_filter']
+            while data['running']:
+                if offset_delta:
+                    messages = consumer.consume(
+                        num_messages=self._count_batch_size(pipeline_name, task.max_event), timeout=0
+                    )
+                    if not messages:
+                        break
+                    handled += len(messages)
+                    self._count_message_batch(
+                        messages, topic, pipeline_name, task.max_event, task.max_time,
+                        data['rate_window'], data['rate_threshold'], data['track_event_times'],
+                        data['partition_stats'], event_filter
+                    )
+                else:
+                    msg = consumer.poll(0)
+                    if msg is None:
+                        break
+                    handled += 1
+                    self._handle_message(msg, topic, pipeline_name, task.max_event, task.max_time, data, event_filter)
+                if time.monotonic() >= deadline:
+                    break
+            return handled > 0
         except Exception as e:
-            logging.error(f"Consumer {consumer_id} error: {e}")
-        finally:
-            consumer.close()
-            self._mark_consumer_stopped(consumer_id)
+            logging.error(f"Consumer {task.consumer_id} error: {e}")
+            self._close_consumer(task)
+            return None
+
+    def _handle_message(self, msg, topic: str, pipeline_name: str, max_event: int, max_time: int,
+                        data: dict, event_filter: Optional[ConsumerEventFilter]):
+        if msg.error():
+            self._handle_kafka_error(msg.error(), topic)
+            return
+
+        payload = None
+        if event_filter is not None and msg.value() is not None:
+            passed, payload = event_filter.evaluate(msg)
+            if not passed:
+                return
+
+        self._process_message(
+            msg, pipeline_name, max_event, max_time, data['rate_window'], data['rate_threshold'], payload
+        )
+
+    def _close_consumer(self, task: 'ConsumerTask'):
+        try:
+            task.data['consumer'].close()
+        except RuntimeError:
+            pass
+        self._mark_consumer_stopped(task.consumer_id)
 
     def _handle_kafka_error(self, error: KafkaError, topic: str):
         if error.code() == KafkaError._PARTITION_EOF:
@@ -119,43 +427,144 @@ class KafkaConsumerService:
             if consumer_id in self.consumers:
                 self.consumers[consumer_id]['running'] = False
 
-    def _process_message(self, msg, pipeline_name: str, max_event: int, max_time: int):
-        message = json.loads(msg.value().decode('utf-8'))
-        payload = message.get('payload', {})
+    def _process_message(self, msg, pipeline_name: str, max_event: int, max_time: int,
+                         rate_window: Optional[SlidingWindowRate] = None, rate_threshold: Optional[float] = None,
+                         payload: Optional[dict] = None):
+        if msg.value() is None:
+            return
+        if payload is None:
+            message = json.loads(msg.value().decode('utf-8'))
+            payload = message.get('payload', {})
         
         event_type = self._get_event_type(payload.get('op'))
-        date_time, formatted_date = self._parse_timestamp(payload.get('ts_ms'))
+        event_time_ms = self._event_time_ms(payload.get('ts_ms'))
+        if rate_window is not None:
+            rate_window.add(event_time_ms or int(time.time() * 1000))
         
         source = payload.get('source', {})
         self._update_redis_state(
             pipeline_name, 
             event_type,
-            formatted_date,
+            event_time_ms,
             source.get('table'),
             source.get('schema'),
             source.get('db'),
             max_event,
-            max_time
+            max_time,
+            rate_window,
+            rate_threshold
+        )
+
+    def _decode_payload(self, msg) -> dict:
+        try:
+            return json.loads(msg.value().decode('utf-8')).get('payload') or {}
+        except (ValueError, AttributeError):
+            return {}
+
+    def _record_time_ms(self, msg) -> Optional[int]:
+        timestamp_type, timestamp_ms = msg.timestamp()
+        return timestamp_ms if timestamp_type != TIMESTAMP_NOT_AVAILABLE else None
+
+    def _count_batch_size(self, pipeline_name: str, max_event: int) -> int:
+        """
+        Caps an offset-delta batch at the events left before the `max_event` sync. Each message is at most
+        one event, so a batch never carries the count past the threshold, where the reset would drop it.
+        """
+        event_count = self._get_event_data(self._generate_redis_key(pipeline_name)).get('event_count', 0)
+        return max(1, min(COUNT_BATCH_SIZE, max_event - event_count))
+
+    def _count_message_batch(self, messages: list, topic: str, pipeline_name: str, max_event: int, max_time: int,
+                             rate_window: Optional[SlidingWindowRate] = None, rate_threshold: Optional[float] = None,
+                             track_event_times: bool = True, partition_stats: Optional[dict] = None,
+                             event_filter: Optional[ConsumerEventFilter] = None):
+        """
+        Counts a consumed batch from per-partition offset deltas without decoding payloads. Offsets that are
+        never delivered (compacted records, transaction markers), tombstones and events rejected by
+        `event_filter` are not counted as events. Only the first and last events of the batch are decoded,
+        and only when event times are tracked; otherwise their Kafka record timestamps stand in for them.
+        """
+        partition_stats = partition_stats if partition_stats is not None else {}
+        first_event = last_event = None
+        batch_count = 0
+        for msg in messages:
+            if msg.error():
+                self._handle_kafka_error(msg.error(), topic)
+                continue
+            stats = partition_stats.get(msg.partition())
+            if stats is None:
+                stats = partition_stats[msg.partition()] = {
+                    'position': msg.offset(), 'events': 0, 'tombstones': 0, 'filtered': 0, 'offset_gaps': 0
+                }
+            offset = msg.offset()
+            if offset > stats['position']:
+                stats['offset_gaps'] += offset - stats['position']
+            stats['position'] = offset + 1
+            if msg.value() is None:
+                stats['tombstones'] += 1
+                continue
+            if event_filter is not None and not event_filter.evaluate(msg)[0]:
+                stats['filtered'] += 1
+                continue
+            stats['events'] += 1
+            batch_count += 1
+            if first_event is None:
+                first_event = msg
+            last_event = msg
+
+        if not batch_count:
+            return
+
+        first_payload, last_payload = {}, {}
+        if track_event_times:
+            first_payload = self._decode_payload(first_event)
+            last_payload = first_payload if last_event is first_event else self._decode_payload(last_event)
+            first_event_time_ms = self._event_time_ms(first_payload.get('ts_ms'))
+            last_event_time_ms = self._event_time_ms(last_payload.get('ts_ms'))
+        else:
+            first_event_time_ms = self._record_time_ms(first_event)
+            last_event_time_ms = self._record_time_ms(last_event)
+        if rate_window is not None:
+            rate_window.add(last_event_time_ms or int(time.time() * 1000), batch_count)
+
+        source = last_payload.get('source') or {}
+        self._update_redis_state(
+            pipeline_name,
+            self._get_event_type(last_payload.get('op')) if last_payload else None,
+            last_event_time_ms,
+            source.get('table') or '',
+            source.get('schema') or '',
+            source.get('db') or '',
+            max_event,
+            max_time,
+            rate_window,
+            rate_threshold,
+            count=batch_count,
+            first_event_time_ms=first_event_time_ms
         )
-    def _update_redis_state(self, pipeline_name: str, event_type: str, formatted_date: str, 
-                          table: str, schema: str, db: str, max_event: int, max_time: int):
+
+    def _update_redis_state(self, pipeline_name: str, event_type: str, event_time_ms: Optional[int],
+                          table: str, schema: str, db: str, max_event: int, max_time: int,
+                          rate_window: Optional[SlidingWindowRate] = None, rate_threshold: Optional[float] = None,
+                          count: int = 1, first_event_time_ms: Optional[int] = None):
         redis_key = self._generate_redis_key(pipeline_name)
         existing_data = self.redis_client.hgetall(redis_key)
 
         if existing_data and existing_data.get('event'):
-            self._update_existing_event(redis_key, existing_data, event_type, formatted_date)
+            self._update_existing_event(redis_key, existing_data, event_type, event_time_ms, count, first_event_time_ms)
         else:
-            self._create_new_event(redis_key, event_type, formatted_date, table, schema, db)
+            self._create_new_event(redis_key, event_type, event_time_ms, table, schema, db, count, first_event_time_ms)
 
-        self._check_sync_requirements(redis_key, event_type, formatted_date, max_event, max_time)
+        self._check_sync_requirements(
+            redis_key, event_type, event_time_ms, max_event, max_time, rate_window, rate_threshold
+        )
 
-    def _create_new_event(self, redis_key: str, event_type: str, formatted_date: str,
-                        table: str, schema: str, db: str):
+    def _create_new_event(self, redis_key: str, event_type: Optional[str], event_time_ms: Optional[int],
+                        table: str, schema: str, db: str, count: int = 1, first_event_time_ms: Optional[int] = None):
         new_event = {
-            'event_type': event_type,
-            'first_event_time': formatted_date,
-            'last_event_time': formatted_date,
-            'event_count': 1
+            'event_type': event_type or 'unknown',
+            'first_event_time': first_event_time_ms if first_event_time_ms is not None else event_time_ms,
+            'last_event_time': event_time_ms,
+            'event_count': count
         }
         redis_message = {
             'table_name': table,
@@ -166,24 +575,34 @@ class KafkaConsumerService:
         self.redis_client.hset(redis_key, mapping=redis_message)
 
     def _update_existing_event(self, redis_key: str, existing_data: dict, 
-                             event_type: str, formatted_date: str):
+                             event_type: Optional[str], event_time_ms: Optional[int],
+                             count: int = 1, first_event_time_ms: Optional[int] = None):
         existing_event = json.loads(existing_data['event'])
+        first_event_time = self._as_epoch_ms(existing_event.get('first_event_time'))
+        if first_event_time is None:
+            first_event_time = first_event_time_ms if first_event_time_ms is not None else event_time_ms
+        last_event_time = event_time_ms
+        if last_event_time is None:
+            last_event_time = self._as_epoch_ms(existing_event.get('last_event_time'))
         updated_event = {
-            'event_type': event_type,
-            'first_event_time': existing_event.get('first_event_time', formatted_date),
-            'last_event_time': formatted_date,
-            'event_count': existing_event.get('event_count', 0) + 1
+            'event_type': event_type or existing_event.get('event_type', 'unknown'),
+            'first_event_time': first_event_time,
+            'last_event_time': last_event_time,
+            'event_count': existing_event.get('event_count', 0) + count
         }
         self.redis_client.hset(redis_key, 'event', json.dumps(updated_event))
 
-    def _check_sync_requirements(self, redis_key: str, event_type: str, 
-                               formatted_date: str, max_event: int, max_time: int):
+    def _check_sync_requirements(self, redis_key: str, event_type: str, event_time_ms: Optional[int],
+                               max_event: int, max_time: int,
+                               rate_window: Optional[SlidingWindowRate] = None, rate_threshold: Optional[float] = None):
         event_data = self._get_event_data(redis_key)
         if not event_data:
             return
 
-        if self._should_trigger_sync(event_data, max_event, max_time):
-            self.trigger_sync(redis_key, event_type, formatted_date)
+        if self._should_trigger_sync(event_data, max_event, max_time, rate_window, rate_threshold):
+            self.trigger_sync(redis_key, event_type, event_time_ms)
+            if rate_window is not None:
+                rate_window.reset()
 
     def _get_event_data(self, redis_key: str) -> dict:
         try:
@@ -193,28 +612,34 @@ class KafkaConsumerService:
             logging.error(f"Invalid JSON in Redis key {redis_key}")
             return {}
 
-    def _should_trigger_sync(self, event_data: dict, max_event: int, max_time: int) -> bool:
+    def _should_trigger_sync(self, event_data: dict, max_event: int, max_time: int,
+                             rate_window: Optional[SlidingWindowRate] = None,
+                             rate_threshold: Optional[float] = None) -> bool:
         if event_data.get('event_count', 0) >= max_event:
             logging.info(f"Event count threshold reached: {event_data['event_count']}")
             return True
 
-        last_event_str = event_data.get('last_event_time')
-        if not last_event_str:
+        if rate_window is not None and rate_threshold is not None:
+            rate = rate_window.rate()
+            if rate > rate_threshold:
+                logging.info(
+                    f"Event rate threshold reached: {rate:.2f} events/s over {rate_window.window_seconds}s"
+                )
+                return True
+
+        last_event_ms = self._as_epoch_ms(event_data.get('last_event_time'))
+        if last_event_ms is None:
             return False
 
-        try:
-            last_event = datetime.strptime(last_event_str, '%Y-%m-%d %H:%M:%S')
-            time_diff = datetime.utcnow() - last_event
-            if time_diff.total_seconds() > max_time:
-                logging.info(f"Time threshold reached: {time_diff} since last event")
-                return True
-        except Exception as e:
-            logging.error(f"Error parsing last event time: {e}")
+        elapsed_ms = time.time() * 1000 - last_event_ms
+        if elapsed_ms > max_time * 1000:
+            logging.info(f"Time threshold reached: {elapsed_ms / 1000:.3f}s since last event")
+            return True
         
         return False
 
-    def trigger_sync(self, redis_key: str, event_type: str, formatted_date: str):
-        print(f"Sync triggered for {redis_key} ({event_type} at {formatted_date})")
+    def trigger_sync(self, redis_key: str, event_type: str, event_time_ms: Optional[int]):
+        print(f"Sync triggered for {redis_key} ({event_type} at {self._format_epoch_ms(event_time_ms)})")
         self._reset_event_count(redis_key)
 
     def _reset_event_count(self, redis_key: str):
@@ -226,6 +651,246 @@ class KafkaConsumerService:
         self.redis_client.hset(redis_key, 'event', json.dumps(event_data))
         print(f"Reset event count for {redis_key}")
 
+    def _create_replay_consumer(self, group_id: str) -> Consumer:
+        return Consumer({
+            'bootstrap.servers': self.kafka_broker,
+            'group.id': group_id,
+            'enable.auto.commit': False,
+            'enable.auto.offset.store': False,
+            'auto.offset.reset': 'earliest'
+        })
+
+    def _plan_replay(self, request: ReplayRequest, group_id: str, progress: ReplayProgress) -> list:
+        """Resolves the [start, end) offset range of every partition from the requested times."""
+        consumer = self._create_replay_consumer(group_id)
+        try:
+            metadata = consumer.list_topics(request.kafka_topic, timeout=10)
+            topic_metadata = metadata.topics.get(request.kafka_topic)
+            if topic_metadata is None or topic_metadata.error is not None or not topic_metadata.partitions:
+                raise HTTPException(status_code=404, detail=f"Topic '{request.kafka_topic}' not found")
+
+            partitions = sorted(topic_metadata.partitions)
+            starts = consumer.offsets_for_times(
+                [TopicPartition(request.kafka_topic, p, request.start_time_ms()) for p in partitions], timeout=10
+            )
+            ends = None
+            if request.end_time_ms() is not None:
+                ends = consumer.offsets_for_times(
+                    [TopicPartition(request.kafka_topic, p, request.end_time_ms()) for p in partitions], timeout=10
+                )
+
+            ranges = []
+            for index, partition in enumerate(partitions):
+                low, high = consumer.get_watermark_offsets(
+                    TopicPartition(request.kafka_topic, partition), timeout=10
+                )
+                start = starts[index].offset if starts[index].offset >= 0 else high
+                end = high
+                if ends is not None and ends[index].offset >= 0:
+                    end = min(ends[index].offset, high)
+                start = max(start, low)
+                progress.plan(partition, start, max(start, end))
+                if start < end:
+                    ranges.append((partition, start, end))
+            return ranges
+        finally:
+            consumer.close()
+
+    def _new_replay_aggregate(self) -> dict:
+        return {'event_count': 0, 'first_event_time': None, 'last_event_time': None, 'last_op': None, 'source': None}
+
+    def _replay_partitions(self, topic: str, group_id: str, ranges: list, progress: ReplayProgress,
+                           filters: Optional[EventFilter] = None) -> dict:
+        """
+        Reads the given partition ranges with one consumer and folds the events that pass `filters` into a
+        partial aggregate.
+        """
+        aggregate = self._new_replay_aggregate()
+        # Compiled per reader: ConsumerEventFilter keeps unsynchronised stats.
+        event_filter = ConsumerEventFilter(filters) if filters else None
+        remaining = {partition: end for partition, _, end in ranges}
+        idle_polls = 0
+        consumer = self._create_replay_consumer(group_id)
+        try:
+            consumer.assign([TopicPartition(topic, partition, start) for partition, start, _ in ranges])
+            while remaining:
+                messages = consumer.consume(num_messages=REPLAY_BATCH_SIZE, timeout=1.0)
+                if not messages:
+                    idle_polls += 1
+                    if idle_polls >= REPLAY_IDLE_POLLS:
+                        idle_polls = 0
+                        if not self._settle_idle_partitions(consumer, topic, remaining, progress):
+                            # No partition moved: leave the rest unfinished for replay_pipeline to report.
+                            break
+                    continue
+                idle_polls = 0
+
+                batches = {}
+                for msg in messages:
+                    if msg.error():
+                        self._handle_kafka_error(msg.error(), topic)
+                        continue
+                    partition = msg.partition()
+                    end = remaining.get(partition)
+                    if end is None:
+                        continue
+                    batch = batches.setdefault(partition, [0, 0, 0, msg.offset() + 1])
+                    if msg.offset() >= end:
+                        batch[3] = end
+                        continue
+                    batch[3] = msg.offset() + 1
+                    payload = None
+                    if event_filter is not None and msg.value() is not None:
+                        passed, payload = event_filter.evaluate(msg)
+                        if not passed:
+                            batch[2] += 1
+                            continue
+                    if self._fold_replayed_message(aggregate, msg, payload):
+                        batch[0] += 1
+                    else:
+                        batch[1] += 1
+
+                finished = []
+                for partition, (processed, skipped, filtered, position) in batches.items():
+                    progress.advance(partition, position, processed, skipped, filtered)
+                    if position >= remaining[partition]:
+                        finished.append(TopicPartition(topic, partition))
+                        del remaining[partition]
+                if finished:
+                    consumer.pause(finished)
+        finally:
+            consumer.close()
+        return aggregate
+
+    def _settle_idle_partitions(self, consumer: Consumer, topic: str, remaining: dict,
+                                progress: ReplayProgress) -> bool:
+        """
+        Checks the consumer position of the partitions still being read after a run of empty polls.
+        Offsets below the end that are never delivered (compacted away or transaction markers) still move
+        the position, so a partition at or past its end offset is finished. Returns whether any partition
+        finished or moved, i.e. whether the reader should keep polling.
+        """
+        positions = consumer.position([TopicPartition(topic, partition) for partition in remaining])
+        moved = False
+        finished = []
+        for topic_partition in positions:
+            partition, position = topic_partition.partition, topic_partition.offset
+            if position < 0 or position <= progress.position(partition):
+                continue
+            moved = True
+            progress.advance(partition, min(position, remaining[partition]), 0, 0)
+            if position >= remaining[partition]:
+                finished.append(TopicPartition(topic, partition))
+                del remaining[partition]
+        if finished:
+            consumer.pause(finished)
+        return moved
+
+    def _fold_replayed_message(self, aggregate: dict, msg, payload: Optional[dict] = None) -> bool:
+        value = msg.value()
+        if value is None:
+            return False
+        if payload is None:
+            try:
+                payload = json.loads(value.decode('utf-8')).get('payload') or {}
+            except (ValueError, AttributeError):
+                return False
+
+        aggregate['event_count'] += 1
+        event_time_ms = self._event_time_ms(payload.get('ts_ms'))
+        if event_time_ms is not None:
+            if aggregate['first_event_time'] is None or event_time_ms < aggregate['first_event_time']:
+                aggregate['first_event_time'] = event_time_ms
+            if aggregate['last_event_time'] is None or event_time_ms >= aggregate['last_event_time']:
+                aggregate['last_event_time'] = event_time_ms
+                aggregate['last_op'] = payload.get('op')
+        if aggregate['source'] is None:
+            aggregate['source'] = payload.get('source') or {}
+        return True
+
+    def _merge_replay_aggregates(self, aggregates: list) -> dict:
+        merged = self._new_replay_aggregate()
+        for aggregate in aggregates:
+            merged['event_count'] += aggregate['event_count']
+            first, last = aggregate['first_event_time'], aggregate['last_event_time']
+            if first is not None and (merged['first_event_time'] is None or first < merged['first_event_time']):
+                merged['first_event_time'] = first
+            if last is not None and (merged['last_event_time'] is None or last >= merged['last_event_time']):
+                merged['last_event_time'] = last
+                merged['last_op'] = aggregate['last_op']
+            if merged['source'] is None and aggregate['source']:
+                merged['source'] = aggregate['source']
+        return merged
+
+    def _replay_filters(self, request: ReplayRequest) -> Optional[EventFilter]:
+        """The filters given with the request, or those of the running consumer it names."""
+        if request.consumer_id is None:
+            return request.filters
+        with self.consumers_lock:
+            consumer_info = self.consumers.get(request.consumer_id)
+        if consumer_info is None:
+            raise HTTPException(status_code=404, detail=f"Consumer '{request.consumer_id}' not running")
+        return consumer_info['filters']
+
+    @handle_exceptions
+    def replay_pipeline(self, request: ReplayRequest, progress: Optional[ReplayProgress] = None) -> dict:
+        """
+        Rebuilds the Redis aggregate of a pipeline from the events retained in Kafka since `start_time`.
+        Partitions are read in parallel by manually assigned consumers of a dedicated group, so the live
+        consumer's group and committed offsets are left untouched.
+        """
+        progress = progress or ReplayProgress()
+        filters = self._replay_filters(request)
+        group_id = f"{request.pipeline_name}-replay-{uuid.uuid4().hex[:8]}"
+        ranges = self._plan_replay(request, group_id, progress)
+
+        workers = min(request.parallelism, len(ranges))
+        aggregates = []
+        if workers:
+            assignments = [ranges[i::workers] for i in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="replay") as executor:
+                aggregates = list(executor.map(
+                    lambda assigned: self._replay_partitions(request.kafka_topic, group_id, assigned, progress, filters),
+                    assignments
+                ))
+        merged = self._merge_replay_aggregates(aggregates)
+
+        unfinished = progress.unfinished()
+        if unfinished:
+            # A partial aggregate would silently replace the full one, so Redis is left as it is.
+            raise HTTPException(status_code=504, detail={
+                "message": f"Replay of pipeline '{request.pipeline_name}' stopped before the end offset of "
+                           f"{len(unfinished)} partition(s); aggregation state left unchanged.",
+                "unfinished_partitions": {str(partition): state for partition, state in unfinished.items()},
+                "progress": progress.snapshot()
+            })
+
+        redis_key = self._generate_redis_key(request.pipeline_name)
+        rebuilt_event = {
+            'event_type': self._get_event_type(merged['last_op']),
+            'first_event_time': merged['first_event_time'],
+            'last_event_time': merged['last_event_time'],
+            'event_count': merged['event_count']
+        }
+        source = merged['source'] or {}
+        if merged['event_count']:
+            self.redis_client.hset(redis_key, mapping={
+                'table_name': source.get('table') or '',
+                'schema_name': source.get('schema') or '',
+                'db_name': source.get('db') or '',
+                'event': json.dumps(rebuilt_event),
+            })
+        else:
+            self.redis_client.delete(redis_key)
+
+        return {
+            "message": f"Rebuilt aggregation state for pipeline '{request.pipeline_name}'.",
+            "pipeline_name": request.pipeline_name,
+            "replay_group_id": group_id,
+            "event": rebuilt_event,
+            "progress": progress.snapshot()
+        }
+
     @handle_exceptions
     def get_consumer_info(self, consumer_id: str):
         with self.consumers_lock:
@@ -235,13 +900,33 @@ class KafkaConsumerService:
             return {"message": f"Consumer '{consumer_id}' not running."}
         
         consumer = consumer_info['consumer']
-        return {
+        with consumer_info['assignment_lock']:
+            assigned_partitions = sorted(consumer_info['assignment'])
+        info = {
             "consumer_id": consumer_id,
             "topic": consumer_info['topic'],
             "running": consumer_info['running'],
             "thread": "running" if consumer_info['running'] else "stopped",
             "consumer_info": str(consumer),
+            "assigned_partitions": assigned_partitions,
+            "rebalance_protocol": "cooperative" if consumer_info['cooperative'] else "eager",
+            "group_instance_id": consumer_info['group_instance_id'],
         }
+        if consumer_info['counting_mode'] == CountingMode.OFFSET_DELTA:
+            info["counting_mode"] = consumer_info['counting_mode'].value
+            info["partitions"] = {
+                str(partition): dict(stats) for partition, stats in list(consumer_info['partition_stats'].items())
+            }
+        if consumer_info['event_filter'] is not None:
+            info["filter"] = consumer_info['event_filter'].report()
+        rate_window = consumer_info['rate_window']
+        if rate_window is not None:
+            info["event_rate"] = {
+                "events_per_second": rate_window.rate(),
+                "window_seconds": rate_window.window_seconds,
+                "threshold": consumer_info['rate_threshold'],
+            }
+        return info
 
     @handle_exceptions
     def list_consumers(self):
@@ -255,5 +940,6 @@ class KafkaConsumerService:
                     "topic": data["topic"],
                     "running": data["running"],
                     "thread_status": "running" if data["running"] else "stopped"
-                } for cid, data in self.consumers.items()]
+                } for cid, data in self.consumers.items()],
+                "scheduler": self.scheduler.stats()
             }
\ No newline at end of file
@@ -1,17 +1,35 @@
+import asyncio
+import json
+import re
+import threading
 from pydantic import ValidationError
 import httpx
+from confluent_kafka import Producer
+from fastapi import HTTPException
 from typing import Optional
-from model.debezium import DebeziumConnectorPayload
+from model.debezium import (
+    DebeziumConnectorPayload, ConnectorState, ConnectorTuningUpdate, DebeziumTuning, CONNECTOR_CLASSES, resolve_tuning,
+    SignalingSetupRequest, IncrementalSnapshotRequest, StopSnapshotRequest, ProvisioningMode
+)
+from model.topic import CreateTopicRequest
 from functools import wraps
 from core.config import settings    
+from services.connect_client import KafkaConnectClient
+from services.topic import KafkaTopicService
+
+class ConnectorStateError(Exception):
+    """The connector exists but its configuration does not allow the requested operation."""
 
 def handle_debezium_errors(func):
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    async def wrapper(*args, **kwargs):
         try:
-            return func(*args, **kwargs)
+            return await func(*args, **kwargs)
         except ValidationError as ve:
             return {"error": f"Validation error: {str(ve)}"}
+        except (HTTPException, ConnectorStateError):
+            # The routers answer these with their 4xx status (ConnectorStateError: 409).
+            raise
         except httpx.HTTPStatusError as e:
             return {"error": f"HTTP error occurred: {e.response.text}"}
         except httpx.RequestError as e:
@@ -20,12 +38,26 @@ def handle_debezium_errors(func):
             return {"error": f"Unexpected error: {str(e)}"}
     return wrapper
 
+SENSITIVE_CONFIG_MARKERS = ("password", "secret", "credentials")
+LITERAL_TABLE_PATTERN = re.compile(r"^[\w$]+(\.[\w$]+)+$")
+
 class DebeziumService:
-    def __init__(self):
+    def __init__(self, connect_client: Optional[KafkaConnectClient] = None,
+                 topic_service: Optional[KafkaTopicService] = None):
         self.connector_url = settings.DEBEZIUM_CONNECTOR_URL  
+        self.topic_service = topic_service or KafkaTopicService(settings.KAFKA_BROKER)
+        self._signal_producer = None
+        self._signal_producer_lock = threading.Lock()
+        self.connect_client = connect_client or KafkaConnectClient(
+            self.connector_url,
+            timeout=settings.DEBEZIUM_HTTP_TIMEOUT,
+            max_connections=settings.DEBEZIUM_HTTP_MAX_CONNECTIONS,
+            max_retries=settings.DEBEZIUM_HTTP_MAX_RETRIES,
+            cache_ttl=settings.DEBEZIUM_CACHE_TTL
+        )
 
     @handle_debezium_errors
-    def start_producer_debezium(self, connector_payload: Optional[DebeziumConnectorPayload] = None):
+    async def start_producer_debezium(self, connector_payload: Optional[DebeziumConnectorPayload] = None):
         """
         Creates a Debezium connector by POSTing the provided payload, retrieves its configuration to construct the
         Kafka topic name, and starts a producer using that topic.
@@ -42,44 +74,284 @@ class DebeziumService:
             "name": payload_dict["name"],
             "config": {str(key).replace("_", "."): value for key, value in payload_dict["config"].items()}
         }
+        tuning = connector_payload.resolve_tuning()
+        if tuning is not None:
+            json_payload["config"].update(tuning.to_connector_config())
+        if connector_payload.event_headers:
+            json_payload["config"].update(connector_payload.event_header_config())
 
-        create_response = httpx.post(
-            self.connector_url,
-            headers={"Content-Type": "application/json", "Accept": "application/json"},
-            json=json_payload,
-            timeout=5.0
-        )
+        provisioning_result = None
+        provisioning = connector_payload.topic_provisioning
+        if provisioning is not None and provisioning.mode == ProvisioningMode.TOPIC_CREATION_GROUPS:
+            json_payload["config"].update(connector_payload.topic_creation_config())
+        elif provisioning is not None:
+            provisioning_result = await self._provision_topics(connector_payload)
+
+        create_response = await self.connect_client.arequest("POST", json=json_payload)
 
         response_json = create_response.json()
+        if provisioning_result is not None:
+            return {"result": response_json, "topic_provisioning": provisioning_result}
         return {"result": response_json}
 
+    async def _provision_topics(self, connector_payload: DebeziumConnectorPayload) -> dict:
+        """
+        Creates the change topic of every literal table in the include list in one admin batch, sized from
+        the table hints. Regex entries cannot be resolved to topic names up front and are reported as skipped.
+        Topics that already exist are left untouched.
+        """
+        provisioning = connector_payload.topic_provisioning
+        compression = connector_payload.topic_compression()
+
+        requests, skipped = [], []
+        for table in connector_payload.included_tables():
+            if not LITERAL_TABLE_PATTERN.match(table):
+                skipped.append(table)
+                continue
+            requests.append(CreateTopicRequest(
+                topic_name=f"{connector_payload.config.topic_prefix}.{table}",
+                num_partitions=provisioning.partitions_for(table),
+                replication_factor=provisioning.replication_factor,
+                retention_ms=provisioning.retention_ms,
+                retention_bytes=provisioning.retention_bytes,
+                compression_type=compression
+            ))
+
+        if not requests:
+            return {"succeeded": 0, "failed": 0, "results": [], "skipped": skipped}
+
+        topic_metadata = await self.topic_service.get_cluster_metadata(refresh=True)
+        existing = [request.topic_name for request in requests if request.topic_name in topic_metadata.topics]
+        missing = [request for request in requests if request.topic_name not in topic_metadata.topics]
+
+        result = await self.topic_service.create_topics(missing) if missing else {"succeeded": 0, "failed": 0, "results": []}
+        partitions = {request.topic_name: request.num_partitions for request in missing}
+        for item in result["results"]:
+            item["partitions"] = partitions[item["topic_name"]]
+        result["results"].extend({"topic_name": name, "status": "exists"} for name in existing)
+        result["skipped"] = skipped
+        return result
+
     @handle_debezium_errors
-    def list_debezium_connectors(self):
+    async def list_debezium_connectors(self):
         """Get list of Debezium connectors."""
-        response = httpx.get(
-            self.connector_url,
-            headers={"Content-Type": "application/json", "Accept": "application/json"},
-            timeout=5.0
-        )
-        response.raise_for_status()
-        return {"result": response.json()}
+        return {"result": await self.connect_client.aget_json()}
 
     @handle_debezium_errors
-    def get_debezium_connector_info(self, connector_name: str):
-        """Get details of a specific Debezium connector."""
-        connector_info_url = f"{self.connector_url}/{connector_name}"
-        response = httpx.get(connector_info_url, timeout=5.0)
-        response.raise_for_status()
-        return {"result": response.json()}
+    async def get_debezium_connector_info(self, connector_name: str):
+        """Get details of a specific Debezium connector. Returns None if the connector does not exist."""
+        connector_info = await self.connect_client.aget_json(f"/{connector_name}")
+        if connector_info is None:
+            return None
+        return {"result": connector_info}
 
     @handle_debezium_errors
-    def delete_debezium_connector(self, connector_name: str):
-        """Delete a Debezium connector."""
-        stop_url = f"{self.connector_url}/{connector_name}"
-        stop_response = httpx.delete(
-            stop_url,
-            headers={"Content-Type": "application/json", "Accept": "application/json"},
-            timeout=5.0
-        )
+    async def delete_debezium_connector(self, connector_name: str):
+        """Delete a Debezium connector. Returns None if the connector does not exist."""
+        stop_response = await self.connect_client.arequest("DELETE", f"/{connector_name}")
+        if stop_response.status_code == 404:
+            return None
         stop_response.raise_for_status()
         return {"result": f"Connector '{connector_name}' deleted successfully."}
+
+    @handle_debezium_errors
+    async def get_connector_fleet(self, state: Optional[ConnectorState] = None, include_config: bool = True):
+        """
+        Returns every connector with its state, worker and per-task status from a single
+        `GET /connectors?expand=status&expand=info` call. When `state` is given, only connectors
+        whose own state or any task state matches are returned.
+        """
+        fleet = await self.connect_client.aget_json(params={"expand": ["status", "info"]})
+
+        connectors = []
+        state_counts = {}
+        for name, entry in sorted((fleet or {}).items()):
+            connector_status = entry.get("status", {})
+            connector_info = entry.get("info", {})
+            connector_state = connector_status.get("connector", {}).get("state")
+            tasks = [
+                {
+                    "id": task.get("id"),
+                    "state": task.get("state"),
+                    "worker_id": task.get("worker_id"),
+                    **({"error": task["trace"].splitlines()[0]} if task.get("trace") else {})
+                }
+                for task in connector_status.get("tasks", [])
+            ]
+            state_counts[connector_state] = state_counts.get(connector_state, 0) + 1
+
+            if state and connector_state != state.value and all(task["state"] != state.value for task in tasks):
+                continue
+
+            summary = {
+                "name": name,
+                "type": connector_status.get("type") or connector_info.get("type"),
+                "state": connector_state,
+                "worker_id": connector_status.get("connector", {}).get("worker_id"),
+                "tasks": tasks
+            }
+            if include_config:
+                summary["config"] = {
+                    key: "********" if any(marker in key.lower() for marker in SENSITIVE_CONFIG_MARKERS) else value
+                    for key, value in connector_info.get("config", {}).items()
+                }
+            connectors.append(summary)
+
+        return {"total": len(fleet or {}), "states": state_counts, "connectors": connectors}
+
+    @handle_debezium_errors
+    async def update_connector_tuning(self, connector_name: str, tuning_update: ConnectorTuningUpdate):
+        """
+        Applies a tuning profile and/or explicit settings to an existing connector by merging them into its
+        current configuration. Kafka Connect restarts the connector tasks with the new settings.
+        Returns None if the connector does not exist.
+        """
+        config_response = await self.connect_client.arequest("GET", f"/{connector_name}/config")
+        if config_response.status_code == 404:
+            return None
+        config_response.raise_for_status()
+        config = config_response.json()
+
+        database_type = CONNECTOR_CLASSES.get(config.get("connector.class"))
+        if database_type is None:
+            raise ConnectorStateError(f"Connector '{connector_name}' is not a supported Debezium connector")
+
+        tuning_config = resolve_tuning(database_type, tuning_update.tuning_profile, tuning_update.tuning).to_connector_config()
+        if tuning_update.tuning_profile is not None:
+            # Switching profiles must not leave settings of the previous profile behind.
+            for key in DebeziumTuning.connector_keys():
+                config.pop(key, None)
+        config.update(tuning_config)
+
+        update_response = await self.connect_client.arequest("PUT", f"/{connector_name}/config", json=config)
+        update_response.raise_for_status()
+        return {"result": {"connector": connector_name, "applied": tuning_config}}
+
+    async def aclose(self):
+        """Releases the Kafka Connect connection pool; called on application shutdown."""
+        await self.connect_client.aclose()
+
+    def get_signal_producer(self) -> Producer:
+        """Return the shared producer used to publish connector signals, creating it on first use."""
+        if self._signal_producer is None:
+            with self._signal_producer_lock:
+                if self._signal_producer is None:
+                    self._signal_producer = Producer({'bootstrap.servers': settings.KAFKA_BROKER})
+        return self._signal_producer
+
+    async def _get_connector_config(self, connector_name: str, cached: bool = True) -> Optional[dict]:
+        if cached:
+            return await self.connect_client.aget_json(f"/{connector_name}/config")
+        response = await self.connect_client.arequest("GET", f"/{connector_name}/config")
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    @handle_debezium_errors
+    async def enable_signaling(self, connector_name: str, setup: SignalingSetupRequest):
+        """
+        Enables the Kafka signal channel on an existing connector. The single-partition signal topic is
+        created through the topic service if missing, and the connector config is updated to read from it.
+        Returns None if the connector does not exist.
+        """
+        config = await self._get_connector_config(connector_name, cached=False)
+        if config is None:
+            return None
+
+        if not setup.signal_topic and not config.get("topic.prefix"):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Connector '{connector_name}' has no 'topic.prefix'; pass signal_topic explicitly."
+            )
+        signal_topic = setup.signal_topic or f"{config['topic.prefix']}-signal"
+        topic_metadata = await self.topic_service.get_cluster_metadata(refresh=True)
+        if signal_topic not in topic_metadata.topics:
+            await self.topic_service.create_topic(CreateTopicRequest(topic_name=signal_topic, num_partitions=1))
+
+        channels = [channel for channel in config.get("signal.enabled.channels", "source").split(",") if channel]
+        if "kafka" not in channels:
+            channels.append("kafka")
+        config.update({
+            "signal.enabled.channels": ",".join(channels),
+            "signal.kafka.topic": signal_topic,
+            "signal.kafka.bootstrap.servers": settings.KAFKA_BROKER,
+        })
+        if setup.signal_data_collection:
+            config["signal.data.collection"] = setup.signal_data_collection
+        if setup.incremental_snapshot_chunk_size:
+            config["incremental.snapshot.chunk.size"] = str(setup.incremental_snapshot_chunk_size)
+
+        response = await self.connect_client.arequest("PUT", f"/{connector_name}/config", json=config)
+        response.raise_for_status()
+        return {"result": {
+            "connector": connector_name,
+            "signal_topic": signal_topic,
+            "signal_channels": config["signal.enabled.channels"],
+            "incremental_snapshot_chunk_size": config.get("incremental.snapshot.chunk.size")
+        }}
+
+    async def _send_signal(self, connector_name: str, signal_type: str, data: dict) -> Optional[dict]:
+        """
+        Publishes a Debezium signal to the connector's Kafka signal topic, keyed by its topic prefix.
+        Returns None if the connector does not exist.
+        """
+        config = await self._get_connector_config(connector_name)
+        if config is None:
+            return None
+        if "kafka" not in config.get("signal.enabled.channels", "").split(",") or not config.get("signal.kafka.topic"):
+            raise ConnectorStateError(f"Kafka signaling is not enabled for connector '{connector_name}'")
+        if not config.get("topic.prefix"):
+            # Debezium only acts on signals keyed by its topic prefix.
+            raise HTTPException(status_code=400, detail=f"Connector '{connector_name}' has no 'topic.prefix' to key signals with.")
+
+        signal_topic = config["signal.kafka.topic"]
+        signal = {"type": signal_type, "data": data}
+        await asyncio.to_thread(self._produce_signal, signal_topic, config["topic.prefix"], signal)
+        return {"result": {"connector": connector_name, "signal_topic": signal_topic, "signal": signal}}
+
+    def _produce_signal(self, topic: str, key: str, signal: dict):
+        delivery_errors = []
+        producer = self.get_signal_producer()
+        producer.produce(
+            topic,
+            key=key,
+            value=json.dumps(signal),
+            on_delivery=lambda err, msg: err and delivery_errors.append(err)
+        )
+        if producer.flush(timeout=10) > 0:
+            raise TimeoutError(f"Timed out delivering signal to '{topic}'")
+        if delivery_errors:
+            raise RuntimeError(f"Failed to deliver signal to '{topic}': {delivery_errors[0]}")
+
+    @handle_debezium_errors
+    async def execute_snapshot(self, connector_name: str, snapshot: IncrementalSnapshotRequest):
+        """Sends an `execute-snapshot` signal for the requested tables, with optional row filters."""
+        data = {
+            "data-collections": snapshot.data_collections,
+            "type": snapshot.snapshot_type.value.upper()
+        }
+        if snapshot.additional_conditions:
+            data["additional-conditions"] = [
+                {"data-collection": condition.data_collection, "filter": condition.filter}
+                for condition in snapshot.additional_conditions
+            ]
+        return await self._send_signal(connector_name, "execute-snapshot", data)
+
+    @handle_debezium_errors
+    async def stop_snapshot(self, connector_name: str, stop: StopSnapshotRequest):
+        """Sends a `stop-snapshot` signal for the listed tables, or for the whole running snapshot."""
+        data = {"type": "INCREMENTAL"}
+        if stop.data_collections:
+            data["data-collections"] = stop.data_collections
+        return await self._send_signal(connector_name, "stop-snapshot", data)
+
+    @handle_debezium_errors
+    async def pause_snapshot(self, connector_name: str):
+        """Sends a `pause-snapshot` signal to the running incremental snapshot."""
+        return await self._send_signal(connector_name, "pause-snapshot", {"type": "INCREMENTAL"})
+
+    @handle_debezium_errors
+    async def resume_snapshot(self, connector_name: str):
+        """Sends a `resume-snapshot` signal to a paused incremental snapshot."""
+        return await self._send_signal(connector_name, "resume-snapshot", {"type": "INCREMENTAL"})
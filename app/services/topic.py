@@ -1,17 +1,30 @@
+import asyncio
+import math
+import re
+import threading
+import time
 from fastapi import FastAPI
-from confluent_kafka.admin import AdminClient, NewTopic, ConfigResource, ResourceType
-from typing import Optional
+from confluent_kafka.admin import (
+    AdminClient, NewTopic, NewPartitions, ConfigResource, ConfigEntry, AlterConfigOpType, ResourceType, OffsetSpec
+)
+from typing import Iterable, List, Optional
 from functools import wraps
-from model.topic import CreateTopicRequest,UpdateTopicRequest
+from model.topic import (
+    CreateTopicRequest, UpdateTopicRequest, ExpandPartitionsRequest, PartitionRecommendationRequest, TopicCompressionType
+)
 from pydantic import ValidationError
 from fastapi import HTTPException
-from confluent_kafka import KafkaException, KafkaError
+from confluent_kafka import KafkaException, KafkaError, TopicPartition
+from core.cache import TTLCache
 
 def handle_kafka_errors(func):
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    async def wrapper(*args, **kwargs):
         try:
-            return func(*args, **kwargs)
+            return await func(*args, **kwargs)
+
+        except HTTPException:
+            raise
         
         except ValidationError as e:
             error_messages = [f"{err['loc'][0]}: {err['msg']}" for err in e.errors()]
@@ -30,35 +43,148 @@ def handle_kafka_errors(func):
 
 
 class KafkaTopicService:
-    def __init__(self, kafka_broker: str):
+    def __init__(self, kafka_broker: str, metadata_ttl: float = 5.0, inventory_ttl: float = 10.0):
         self.kafka_broker = kafka_broker  
+        self._admin_client = None
+        self._admin_client_lock = threading.Lock()
+        self._metadata_cache = TTLCache(ttl=metadata_ttl)
+        self._metadata_lock = threading.Lock()
+        self._inventory_cache = TTLCache(ttl=inventory_ttl)
 
     def get_admin_client(self):
-        """Create and return an AdminClient instance using the stored Kafka broker."""
-        return AdminClient({'bootstrap.servers': self.kafka_broker})
+        """Return the shared AdminClient, creating it on first use. AdminClient is thread-safe."""
+        if self._admin_client is None:
+            with self._admin_client_lock:
+                if self._admin_client is None:
+                    self._admin_client = AdminClient({'bootstrap.servers': self.kafka_broker})
+        return self._admin_client
+
+    async def get_cluster_metadata(self, refresh: bool = False):
+        """
+        Returns cluster metadata, served from a short-lived cache unless `refresh` is set.
+        Concurrent misses are coalesced into a single list_topics round trip, which runs
+        off the event loop because AdminClient.list_topics is blocking.
+        """
+        if not refresh:
+            metadata = self._metadata_cache.get("cluster")
+            if metadata is not None:
+                return metadata
+        return await asyncio.to_thread(self._load_cluster_metadata, refresh)
+
+    def _load_cluster_metadata(self, refresh: bool):
+        with self._metadata_lock:
+            metadata = None if refresh else self._metadata_cache.get("cluster")
+            if metadata is None:
+                metadata = self.get_admin_client().list_topics(timeout=10)
+                self._metadata_cache.set("cluster", metadata)
+            return metadata
+
+    def invalidate_metadata(self, topic_names: Iterable[str] = ()):
+        """
+        Drops cached cluster metadata so the next read goes to the broker, along with the cached inventory
+        statistics of the given topics.
+        """
+        self._metadata_cache.invalidate()
+        for topic_name in topic_names:
+            self._inventory_cache.invalidate(topic_name)
+
+    @staticmethod
+    def _build_topic_config(retention_ms: Optional[int], retention_bytes: Optional[int],
+                            compression_type: Optional[TopicCompressionType] = None) -> dict:
+        config = {}
+        if retention_ms is not None:
+            config["retention.ms"] = str(retention_ms)
+        if retention_bytes is not None:
+            config["retention.bytes"] = str(retention_bytes)
+        if compression_type is not None:
+            config["compression.type"] = compression_type.value
+        return config
+
+    @staticmethod
+    def _incremental_config_resource(topic_name: str, config: dict) -> ConfigResource:
+        """
+        Builds a resource for incremental_alter_configs, which only sets the given keys. alter_configs
+        would reset every other dynamic config of the topic (e.g. compression.type) to its default.
+        """
+        return ConfigResource(ResourceType.TOPIC, topic_name, incremental_configs=[
+            ConfigEntry(key, value, incremental_operation=AlterConfigOpType.SET) for key, value in config.items()
+        ])
+
+    @staticmethod
+    async def _await_future(future, timeout: float = 30):
+        """Awaits an AdminClient future without blocking the event loop."""
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+
+    @staticmethod
+    async def _wait_all(futures: List, timeout: float = 30) -> list:
+        """
+        Waits until every AdminClient future is done or `timeout` expires, without raising. Returns the
+        outcome of each future in order: its result, its exception, or a TimeoutError if still pending.
+        """
+        if not futures:
+            return []
+        wrapped = [asyncio.wrap_future(future) for future in futures]
+        done, _ = await asyncio.wait(wrapped, timeout=timeout)
+        outcomes = []
+        for future in wrapped:
+            if future in done:
+                outcomes.append(future.exception() or future.result())
+            else:
+                # Retrieve a late failure too, or asyncio logs it as never retrieved.
+                future.add_done_callback(lambda late: late.cancelled() or late.exception())
+                outcomes.append(asyncio.TimeoutError("Timed out"))
+        return outcomes
+
+    @classmethod
+    async def _collect_batch_results(cls, futures: dict, success_status: str, timeout: float = 30) -> dict:
+        """
+        Waits on all futures of one admin batch at once and reports the outcome per topic,
+        so a single failing topic does not hide the others.
+        """
+        outcomes = await cls._wait_all(list(futures.values()), timeout=timeout)
+
+        results = []
+        for key, outcome in zip(futures, outcomes):
+            topic_name = key.name if isinstance(key, ConfigResource) else key
+            error = outcome if isinstance(outcome, BaseException) else None
+            if error is None:
+                results.append({"topic_name": topic_name, "status": success_status})
+            elif isinstance(error, asyncio.TimeoutError):
+                results.append({"topic_name": topic_name, "status": "failed", "error": "Timed out"})
+            elif isinstance(error, KafkaException):
+                results.append({"topic_name": topic_name, "status": "failed", "error": error.args[0].str()})
+            else:
+                results.append({"topic_name": topic_name, "status": "failed", "error": str(error)})
+
+        failed = sum(1 for result in results if result["status"] == "failed")
+        return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+    @staticmethod
+    def _reject_duplicates(topic_names: List[str]):
+        seen = set()
+        duplicates = {name for name in topic_names if name in seen or seen.add(name)}
+        if duplicates:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Duplicate topic names in batch: {', '.join(sorted(duplicates))}"
+            )
 
     @handle_kafka_errors
-    def create_topic(self, request: CreateTopicRequest):
+    async def create_topic(self, request: CreateTopicRequest):
         """Creates a Kafka topic dynamically with user-defined partitions, replication factor, and retention policies."""
         admin_client = self.get_admin_client() 
         topic_name = request.topic_name.strip()
         if not topic_name:
             raise ValueError("Topic name cannot be empty.")
         
-        topic_metadata = admin_client.list_topics(timeout=10)
+        topic_metadata = await self.get_cluster_metadata()
         if topic_name in topic_metadata.topics:
             raise HTTPException(status_code=409, detail=f"Topic '{topic_name}' already exists.")
         topic_name = request.topic_name
         num_partitions = request.num_partitions
         replication_factor = request.replication_factor
-        retention_ms = request.retention_ms
-        retention_bytes = request.retention_bytes
 
-        config = {}
-        if retention_ms is not None:
-            config["retention.ms"] = str(retention_ms)
-        if retention_bytes is not None:
-            config["retention.bytes"] = str(retention_bytes)
+        config = self._build_topic_config(request.retention_ms, request.retention_bytes, request.compression_type)
 
         topic_list = [NewTopic(
             topic_name,
@@ -68,44 +194,50 @@ class KafkaTopicService:
         )]
 
         futures = admin_client.create_topics(topic_list)
-        for topic, future in futures.items():
-            future.result(timeout=30)
+        try:
+            for topic, future in futures.items():
+                await self._await_future(future, timeout=30)
+        finally:
+            self.invalidate_metadata([topic_name])
         return {
             "message": f"Topic '{topic_name}' created successfully",
             "partitions": num_partitions,
             "replication_factor": replication_factor,
-            "retention_policy": config
+            "retention_policy": {key: value for key, value in config.items() if key.startswith("retention.")},
+            "compression_type": config.get("compression.type")
         }
 
     @handle_kafka_errors
-    def list_topics(self):
+    async def list_topics(self, refresh: bool = False):
         """Fetches all Kafka topics available in the broker."""
-        admin_client = self.get_admin_client()  # Use the instance's kafka_broker
-        topic_metadata = admin_client.list_topics(timeout=10)
+        topic_metadata = await self.get_cluster_metadata(refresh=refresh)
         topics = list(topic_metadata.topics.keys())
         return {"topics": topics}
 
     @handle_kafka_errors
-    def delete_topic(self, topic_name:str):
+    async def delete_topic(self, topic_name:str):
         """Deletes a Kafka topic."""
         topic_name = topic_name.strip()
         if not topic_name:
             raise ValueError("Topic name cannot be empty.")
 
         admin_client = self.get_admin_client()
-        topic_metadata = admin_client.list_topics(timeout=10)
+        topic_metadata = await self.get_cluster_metadata()
 
         if topic_name not in topic_metadata.topics:
             raise HTTPException(status_code=404, detail=f"Topic '{topic_name}' not found.")
 
         futures = admin_client.delete_topics([topic_name])
-        for topic, future in futures.items():
-            future.result(timeout=30)  # Ensure deletion completes
+        try:
+            for topic, future in futures.items():
+                await self._await_future(future, timeout=30)  # Ensure deletion completes
+        finally:
+            self.invalidate_metadata([topic_name])
 
         return {"message": f"Topic '{topic_name}' deleted successfully"}
 
     @handle_kafka_errors
-    def update_topic(self, request: UpdateTopicRequest):
+    async def update_topic(self, request: UpdateTopicRequest):
         """Updates the retention policies of an existing Kafka topic."""
         topic_name = request.topic_name.strip()
         if not topic_name:
@@ -113,37 +245,268 @@ class KafkaTopicService:
 
         admin_client = self.get_admin_client()  # Use the instance's kafka_broker
 
-        config = {}
-        if request.retention_ms is not None:
-            config["retention.ms"] = str(request.retention_ms)
-        if request.retention_bytes is not None:
-            config["retention.bytes"] = str(request.retention_bytes)
+        config = self._build_topic_config(request.retention_ms, request.retention_bytes)
 
         if not config:
             raise ValueError("At least one retention policy must be specified.")
 
-        resources = [ConfigResource(ResourceType.TOPIC, topic_name, config)]
-        futures = admin_client.alter_configs(resources)
-        for resource, future in futures.items():
-            future.result(timeout=30)
+        topic_metadata = await self.get_cluster_metadata()
+        if topic_name not in topic_metadata.topics:
+            raise HTTPException(status_code=404, detail=f"Topic '{topic_name}' not found.")
+
+        resources = [self._incremental_config_resource(topic_name, config)]
+        futures = admin_client.incremental_alter_configs(resources)
+        try:
+            for resource, future in futures.items():
+                await self._await_future(future, timeout=30)
+        finally:
+            self.invalidate_metadata([topic_name])
 
         return {"message": f"Topic '{topic_name}' updated successfully with new retention policies"}
 
     @handle_kafka_errors
-    def get_topic_config(self, topic_name:str):
+    async def create_topics(self, requests: List[CreateTopicRequest]):
+        """Creates many topics with a single create_topics call and reports the result per topic."""
+        self._reject_duplicates([request.topic_name.strip() for request in requests])
+
+        new_topics = [
+            NewTopic(
+                request.topic_name.strip(),
+                num_partitions=request.num_partitions,
+                replication_factor=request.replication_factor,
+                config=self._build_topic_config(request.retention_ms, request.retention_bytes, request.compression_type)
+            )
+            for request in requests
+        ]
+
+        futures = self.get_admin_client().create_topics(new_topics)
+        try:
+            return await self._collect_batch_results(futures, success_status="created")
+        finally:
+            self.invalidate_metadata(futures.keys())
+
+    @handle_kafka_errors
+    async def update_topics(self, requests: List[UpdateTopicRequest]):
+        """Updates retention policies of many topics with a single incremental_alter_configs call."""
+        self._reject_duplicates([request.topic_name.strip() for request in requests])
+
+        resources = []
+        for request in requests:
+            config = self._build_topic_config(request.retention_ms, request.retention_bytes)
+            if not config:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"At least one retention policy must be specified for topic '{request.topic_name}'."
+                )
+            resources.append(self._incremental_config_resource(request.topic_name.strip(), config))
+
+        futures = self.get_admin_client().incremental_alter_configs(resources)
+        try:
+            return await self._collect_batch_results(futures, success_status="updated")
+        finally:
+            self.invalidate_metadata(resource.name for resource in resources)
+
+    @handle_kafka_errors
+    async def delete_topics(self, topic_names: List[str]):
+        """Deletes many topics with a single delete_topics call and reports the result per topic."""
+        topic_names = [topic_name.strip() for topic_name in topic_names]
+        if not all(topic_names):
+            raise HTTPException(status_code=400, detail="Topic names cannot be empty.")
+        self._reject_duplicates(topic_names)
+
+        futures = self.get_admin_client().delete_topics(topic_names)
+        try:
+            return await self._collect_batch_results(futures, success_status="deleted")
+        finally:
+            self.invalidate_metadata(topic_names)
+
+    @handle_kafka_errors
+    async def get_topic_inventory(self, prefix: Optional[str] = None, pattern: Optional[str] = None,
+                            include_internal: bool = False, offset: int = 0, limit: int = 100,
+                            refresh: bool = False):
+        """
+        Returns a filtered, paginated inventory of topics with partition count, replication factor
+        and per-partition low/high watermarks. Statistics are only gathered for the requested page
+        and are cached briefly per topic.
+        """
+        try:
+            regex = re.compile(pattern) if pattern else None
+        except re.error as e:
+            raise HTTPException(status_code=400, detail=f"Invalid topic pattern: {str(e)}")
+
+        topic_metadata = await self.get_cluster_metadata(refresh=refresh)
+        topic_names = sorted(
+            name for name in topic_metadata.topics
+            if (include_internal or not name.startswith("__"))
+            and (not prefix or name.startswith(prefix))
+            and (regex is None or regex.search(name))
+        )
+        page = topic_names[offset:offset + limit]
+
+        if refresh:
+            self._inventory_cache.invalidate()
+        inventory = {name: self._inventory_cache.get(name) for name in page}
+        missing = [name for name, stats in inventory.items() if stats is None]
+        if missing:
+            for name, stats in (await self._collect_topic_statistics(topic_metadata, missing)).items():
+                self._inventory_cache.set(name, stats)
+                inventory[name] = stats
+
+        return {
+            "total": len(topic_names),
+            "offset": offset,
+            "limit": limit,
+            "topics": [inventory[name] for name in page]
+        }
+
+    async def _collect_topic_statistics(self, topic_metadata, topic_names: List[str]) -> dict:
+        """Resolves earliest and latest offsets of every partition of `topic_names` in two concurrent batches."""
+        partitions = [
+            TopicPartition(name, partition_id)
+            for name in topic_names
+            for partition_id in topic_metadata.topics[name].partitions
+        ]
+
+        watermarks = {}
+        if partitions:
+            admin_client = self.get_admin_client()
+            low_futures = admin_client.list_offsets(
+                {tp: OffsetSpec.earliest() for tp in partitions}, request_timeout=10
+            )
+            high_futures = admin_client.list_offsets(
+                {tp: OffsetSpec.latest() for tp in partitions}, request_timeout=10
+            )
+            outcomes = iter(await self._wait_all(
+                list(low_futures.values()) + list(high_futures.values()), timeout=30
+            ))
+
+            for bound, futures in (("low", low_futures), ("high", high_futures)):
+                for tp, outcome in zip(futures, outcomes):
+                    offset = None if isinstance(outcome, BaseException) else outcome.offset
+                    watermarks[(tp.topic, tp.partition, bound)] = offset
+
+        statistics = {}
+        for name in topic_names:
+            partition_stats = []
+            for partition_id, partition in sorted(topic_metadata.topics[name].partitions.items()):
+                low = watermarks.get((name, partition_id, "low"))
+                high = watermarks.get((name, partition_id, "high"))
+                partition_stats.append({
+                    "partition": partition_id,
+                    "leader": partition.leader,
+                    "replicas": len(partition.replicas),
+                    "in_sync_replicas": len(partition.isrs),
+                    "low_watermark": low,
+                    "high_watermark": high,
+                    "event_count": high - low if low is not None and high is not None else None
+                })
+
+            event_counts = [p["event_count"] for p in partition_stats]
+            statistics[name] = {
+                "topic_name": name,
+                "partition_count": len(partition_stats),
+                "replication_factor": max((p["replicas"] for p in partition_stats), default=0),
+                "event_count": sum(event_counts) if None not in event_counts else None,
+                "partitions": partition_stats
+            }
+        return statistics
+
+    @handle_kafka_errors
+    async def expand_partitions(self, request: ExpandPartitionsRequest):
+        """Grows a topic to `num_partitions` partitions. Existing partitions and their data are untouched."""
+        topic_name = request.topic_name.strip()
+        topic_metadata = await self.get_cluster_metadata(refresh=True)
+        if topic_name not in topic_metadata.topics:
+            raise HTTPException(status_code=404, detail=f"Topic '{topic_name}' not found.")
+
+        current_partitions = len(topic_metadata.topics[topic_name].partitions)
+        if request.num_partitions <= current_partitions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Topic '{topic_name}' already has {current_partitions} partitions; the partition count can only grow."
+            )
+
+        futures = self.get_admin_client().create_partitions([NewPartitions(topic_name, request.num_partitions)])
+        try:
+            for topic, future in futures.items():
+                await self._await_future(future, timeout=30)
+        finally:
+            self.invalidate_metadata([topic_name])
+
+        return {
+            "message": f"Topic '{topic_name}' expanded to {request.num_partitions} partitions",
+            "previous_partitions": current_partitions,
+            "partitions": request.num_partitions
+        }
+
+    @handle_kafka_errors
+    async def recommend_partitions(self, request: PartitionRecommendationRequest):
+        """
+        Suggests a partition count so that consumers, one per partition, keep up with the producer rate:
+        ceil(producer_rate * headroom / consumer_throughput_per_partition), never below the current count.
+        """
+        topic_name = request.topic_name.strip()
+        topic_metadata = await self.get_cluster_metadata()
+        if topic_name not in topic_metadata.topics:
+            raise HTTPException(status_code=404, detail=f"Topic '{topic_name}' not found.")
+
+        current_partitions = len(topic_metadata.topics[topic_name].partitions)
+        producer_rate = request.producer_rate
+        measured = producer_rate is None
+        if measured:
+            producer_rate = await self._measure_producer_rate(topic_metadata, topic_name, request.sample_seconds)
+
+        required_partitions = math.ceil(producer_rate * request.headroom / request.consumer_throughput_per_partition)
+        recommended_partitions = max(current_partitions, required_partitions, 1)
+
+        return {
+            "topic_name": topic_name,
+            "producer_rate": round(producer_rate, 3),
+            "producer_rate_measured": measured,
+            "consumer_throughput_per_partition": request.consumer_throughput_per_partition,
+            "headroom": request.headroom,
+            "current_partitions": current_partitions,
+            "recommended_partitions": recommended_partitions,
+            "expansion_required": recommended_partitions > current_partitions
+        }
+
+    async def _measure_producer_rate(self, topic_metadata, topic_name: str, sample_seconds: float) -> float:
+        """Samples the sum of high watermarks twice, `sample_seconds` apart, and returns events per second."""
+        partitions = [
+            TopicPartition(topic_name, partition_id)
+            for partition_id in topic_metadata.topics[topic_name].partitions
+        ]
+        if not partitions:
+            return 0.0
+
+        async def high_watermark_total() -> int:
+            futures = self.get_admin_client().list_offsets(
+                {tp: OffsetSpec.latest() for tp in partitions}, request_timeout=10
+            )
+            results = await asyncio.gather(*(self._await_future(future) for future in futures.values()))
+            return sum(result.offset for result in results)
+
+        first = await high_watermark_total()
+        started_at = time.monotonic()
+        await asyncio.sleep(sample_seconds)
+        second = await high_watermark_total()
+        return max(second - first, 0) / (time.monotonic() - started_at)
+
+    @handle_kafka_errors
+    async def get_topic_config(self, topic_name:str):
         """Fetches the configuration of a specific Kafka topic."""
         topic_name = topic_name.strip()
         if not topic_name:
             raise ValueError("Topic name cannot be empty.")
 
         admin_client = self.get_admin_client()
-        topic_metadata = admin_client.list_topics(timeout=10)
+        topic_metadata = await self.get_cluster_metadata()
         if topic_name not in topic_metadata.topics:
             raise HTTPException(status_code=404, detail=f"Topic '{topic_name}' not found.")
 
         config_resource = ConfigResource(ResourceType.TOPIC, topic_name)
         futures = admin_client.describe_configs([config_resource])
-        result = futures[config_resource].result()
+        result = await self._await_future(futures[config_resource])
 
         configs = {
             key: {
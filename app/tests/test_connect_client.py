@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from loadtest.standins import StandInConnectServer
+from services.connect_client import KafkaConnectClient
+
+REBALANCE_IN_PROGRESS = "Cannot complete request because of a conflicting operation (e.g. worker rebalance)"
+
+@pytest.fixture
+def connect_server():
+    server = StandInConnectServer(latency_ms=0, connectors=1).start()
+    yield server
+    server.stop()
+
+def run(connect_server, call):
+    async def main():
+        client = KafkaConnectClient(connect_server.url, backoff_base=0.01, backoff_max=0.01)
+        try:
+            return await call(client)
+        finally:
+            await client.aclose()
+    return asyncio.run(main())
+
+def test_retries_through_rebalance_conflicts(connect_server):
+    connect_server.fail_next(409, REBALANCE_IN_PROGRESS, times=2)
+    payload = {"name": "orders", "config": {"topic.prefix": "orders"}}
+
+    response = run(connect_server, lambda client: client.arequest("POST", json=payload))
+
+    assert response.status_code == 201
+    assert connect_server.failures == []
+    assert connect_server.connectors["orders"] == payload["config"]
+
+def test_does_not_retry_existing_connector_conflict(connect_server):
+    payload = {"name": "connector-0", "config": {"topic.prefix": "other"}}
+
+    response = run(connect_server, lambda client: client.arequest("POST", json=payload))
+
+    assert response.status_code == 409
+    assert connect_server.connectors["connector-0"]["topic.prefix"] == "db0"
+
+def test_does_not_resend_post_after_server_error(connect_server):
+    connect_server.fail_next(500, "Request timed out", times=1)
+    connect_server.fail_next(409, REBALANCE_IN_PROGRESS, times=1)
+    payload = {"name": "orders", "config": {"topic.prefix": "orders"}}
+
+    response = run(connect_server, lambda client: client.arequest("POST", json=payload))
+
+    assert response.status_code == 500
+    assert len(connect_server.failures) == 1
+    assert "orders" not in connect_server.connectors
+
+def test_retries_get_after_server_error(connect_server):
+    connect_server.fail_next(503, "Service Unavailable", times=2)
+
+    assert run(connect_server, lambda client: client.aget_json()) == ["connector-0"]
+
+def test_mutation_drops_cached_reads(connect_server):
+    async def call(client):
+        before = await client.aget_json("/connector-0/config")
+        await client.arequest("PUT", "/connector-0/config", json={"topic.prefix": "renamed"})
+        return before, await client.aget_json("/connector-0/config")
+
+    before, after = run(connect_server, call)
+
+    assert before["topic.prefix"] == "db0"
+    assert after == {"topic.prefix": "renamed"}
+
+def test_read_raced_by_mutation_is_not_cached(connect_server):
+    async def call(client):
+        # A GET that was answered before a PUT but is stored after it must not be cached.
+        generation = client._generation
+        stale = await client.arequest("GET", "/connector-0/config")
+        await client.arequest("PUT", "/connector-0/config", json={"topic.prefix": "renamed"})
+        client._store_json(("/connector-0/config", ""), stale, generation)
+        return await client.aget_json("/connector-0/config")
+
+    assert run(connect_server, call) == {"topic.prefix": "renamed"}
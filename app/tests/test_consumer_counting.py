@@ -0,0 +1,79 @@
+import json
+import time
+import pytest
+from loadtest.standins import StandInMessage, StandInRedis
+from model.consumer import ConsumerCreationRequest, CountingMode
+import services.consumer
+from services.consumer import KafkaConsumerService
+
+TOPIC = "dbserver1.public.orders"
+
+class QueuedConsumer:
+    """Consumer that hands out a fixed list of messages, as many per call as asked for."""
+
+    def __init__(self, messages: list):
+        self.messages = list(messages)
+
+    def subscribe(self, topics, **kwargs):
+        pass
+
+    def poll(self, timeout: float = None):
+        return self.messages.pop(0) if self.messages else None
+
+    def consume(self, num_messages: int = 1, timeout: float = None):
+        batch, self.messages = self.messages[:num_messages], self.messages[num_messages:]
+        return batch
+
+    def close(self):
+        pass
+
+class UnscheduledScheduler:
+    def submit(self, task):
+        pass
+
+def change_events(count: int) -> list:
+    now_ms = int(time.time() * 1000)
+    return [
+        StandInMessage(TOPIC, 0, offset, json.dumps({"payload": {
+            "op": "c", "ts_ms": now_ms, "source": {"db": "inventory", "schema": "public", "table": "orders"}
+        }}).encode())
+        for offset in range(count)
+    ]
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(services.consumer.redis, "StrictRedis", StandInRedis)
+    monkeypatch.setattr(StandInRedis, "latency_ms", 0)
+    monkeypatch.setattr(StandInRedis, "_store", {})
+    return KafkaConsumerService("localhost:9092", scheduler=UnscheduledScheduler())
+
+def count_syncs(service, monkeypatch, counting_mode: CountingMode, events: int, max_event: int) -> list:
+    syncs = []
+
+    def record_sync(redis_key, event_type, event_time_ms):
+        syncs.append(service._get_event_data(redis_key)['event_count'])
+        KafkaConsumerService.trigger_sync(service, redis_key, event_type, event_time_ms)
+
+    monkeypatch.setattr(service, "trigger_sync", record_sync)
+    request = ConsumerCreationRequest(
+        consumer_id=f"{counting_mode.value}-consumer", kafka_topic=TOPIC, pipeline_name=f"{counting_mode.value}-pipeline",
+        max_event=max_event, max_time=3600, counting_mode=counting_mode
+    )
+    service._schedule_consumer(request, QueuedConsumer(change_events(events)))
+    task = service.consumers[request.consumer_id]['task']
+    while service._consume_slice(task, time.monotonic() + 10):
+        pass
+    return syncs
+
+def test_offset_delta_syncs_like_decode_mode(service, monkeypatch):
+    decode_syncs = count_syncs(service, monkeypatch, CountingMode.DECODE, events=1000, max_event=100)
+    offset_delta_syncs = count_syncs(service, monkeypatch, CountingMode.OFFSET_DELTA, events=1000, max_event=100)
+
+    assert decode_syncs == [100] * 10
+    assert offset_delta_syncs == decode_syncs
+
+def test_offset_delta_keeps_events_after_last_sync(service, monkeypatch):
+    syncs = count_syncs(service, monkeypatch, CountingMode.OFFSET_DELTA, events=1050, max_event=100)
+
+    assert syncs == [100] * 10
+    assert service._get_event_data("offset-delta-pipeline")['event_count'] == 50